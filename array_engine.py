@@ -0,0 +1,242 @@
+"""
+NumPy-backed simulation engine for PathogenSpecies.
+
+Region state lives in parallel arrays indexed by region, so the spread step
+is a handful of vectorized operations instead of a Python loop per region.
+`regions` is kept as a dict-like view over those arrays for the UI.
+"""
+
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+from game.evolution import REGION_ARRAYS, PathogenSpecies
+from game.events import RegionDiscovered, RegionInfected
+
+STATE_FIELDS = ("infected", "dead", "population", "healthy", "infection_rate", "discovered")
+
+
+class RegionStateView(MutableMapping):
+    """Dict-like view of one region's row in the engine arrays."""
+
+    __slots__ = ("_engine", "_index")
+
+    def __init__(self, engine, index):
+        self._engine = engine
+        self._index = index
+
+    def __getitem__(self, key):
+        if key not in STATE_FIELDS:
+            raise KeyError(key)
+        return getattr(self._engine, key)[self._index].item()
+
+    def __setitem__(self, key, value):
+        if key not in STATE_FIELDS:
+            raise KeyError(key)
+        getattr(self._engine, key)[self._index] = value
+
+    def __delitem__(self, key):
+        raise TypeError("region state fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(STATE_FIELDS)
+
+    def __len__(self):
+        return len(STATE_FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class RegionsView(Mapping):
+    """Read-only mapping of region id -> RegionStateView."""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self._world = engine.world
+
+    def __getitem__(self, region_id):
+        return RegionStateView(self._engine, self._world.index[region_id])
+
+    def __iter__(self):
+        return iter(self._world.ids)
+
+    def __len__(self):
+        return len(self._world)
+
+    def column(self, field):
+        """One state field of every region, as the underlying array."""
+        return getattr(self._engine, field)
+
+
+class FrozenRegionArrays:
+    """Read-only copies of an engine's region arrays."""
+
+    def __init__(self, engine):
+        self.world = engine.world
+        for name in STATE_FIELDS:
+            arr = getattr(engine, name).copy()
+            arr.flags.writeable = False
+            setattr(self, name, arr)
+
+
+class ArrayPathogenSpecies(PathogenSpecies):
+    """PathogenSpecies with vectorized per-region state."""
+
+    def _init_regions(self, origin_region_id):
+        world = self.world
+        n = len(world)
+        self.np_rng = np.random.default_rng(self.seed)
+        self._climate = np.array(world.climate, dtype=np.int8)
+        self._ports = np.array(world.ports, dtype=np.float64)
+        self._jump_seed = np.array(world.jump_seed, dtype=np.int64)
+        self.population = np.array(world.population, dtype=np.int64)
+        self.healthy = self.population.copy()
+        self.infected = np.zeros(n, dtype=np.int64)
+        self.dead = np.zeros(n, dtype=np.int64)
+        self.infection_rate = np.zeros(n, dtype=np.float64)
+        self.discovered = np.zeros(n, dtype=bool)
+        self.regions = RegionsView(self)
+
+        # Seed origin
+        i = world.index[origin_region_id]
+        seed = world.origin_seed[i]
+        self.infected[i] = seed
+        self.healthy[i] -= seed
+        self._recount()
+
+    def _recount(self):
+        self.total_infected = int(self.infected.sum())
+        self.total_dead = int(self.dead.sum())
+        self.regions_hit = int(np.count_nonzero(self.infected))
+        self.regions_discovered = int(np.count_nonzero(self.discovered))
+        self._changed()
+
+    def reseed(self, seed):
+        super().reseed(seed)
+        self.np_rng = np.random.default_rng(seed)
+
+    def _fork_regions(self, twin):
+        for field, _ in REGION_ARRAYS:
+            setattr(twin, field, getattr(self, field).copy())
+        # Fixed seed so the new bit generator skips OS entropy; its state is replaced
+        bits = type(self.np_rng.bit_generator)(0)
+        bits.state = self.np_rng.bit_generator.state
+        twin.np_rng = np.random.Generator(bits)
+        twin.regions = RegionsView(twin)
+
+    def export_regions(self):
+        return {field: getattr(self, field).copy() for field, _ in REGION_ARRAYS}
+
+    def region_column(self, field):
+        return getattr(self, field)
+
+    def import_regions(self, arrays):
+        for field, dtype in REGION_ARRAYS:
+            setattr(self, field, np.array(arrays[field], dtype=dtype))
+        self._recount()
+
+    def region_snapshot(self):
+        return RegionsView(FrozenRegionArrays(self))
+
+    def _fastest_rate(self):
+        idx = np.flatnonzero((self.infected > 0) & (self.population > 0))
+        if not idx.size:
+            return 0.0, 0.0
+        pop = self.population[idx]
+        max_ratio = float((self.infected[idx] / pop).max())
+
+        growing = self.healthy[idx] > 0
+        if not growing.any():
+            return 0.0, max_ratio
+        idx = idx[growing]
+        pop = pop[growing]
+        c = self._coefficients()
+        loss = c.death + c.recover * c.recover_stealth
+        spread_rate = c.trans * np.array(c.climate_mods)[self._climate[idx]]
+        spread_rate += c.base
+        spread_rate += c.water * self._ports[idx]
+        growth = spread_rate * (self.healthy[idx] / pop)
+        return float(growth.max()) + loss, max_ratio
+
+    def _region_spread(self, climate_spread, air, water, animal):
+        per_port = self.balance["water_spread"]
+        return np.array(climate_spread)[self._climate] + air + water * self._ports * per_port + animal
+
+    def _spread(self, dt):
+        c = self._coefficients()
+
+        idx = np.flatnonzero((self.infected > 0) & (self.healthy > 0))
+        if idx.size:
+            pop = self.population[idx]
+            infected = self.infected[idx]
+            healthy = self.healthy[idx]
+            spread_rate = c.spread[idx]
+
+            # New infections
+            new_inf = (infected * spread_rate * (healthy / pop) * dt).astype(np.int64)
+            new_inf = np.clip(new_inf, 0, healthy)
+
+            # Deaths
+            death_rate = c.death * dt
+            new_dead = np.maximum((infected * death_rate).astype(np.int64), 0)
+
+            # Recoveries (lowered by resistance)
+            recover_rate = c.recover * dt
+            recovered = (infected * recover_rate * c.recover_stealth).astype(np.int64)
+
+            now_infected = np.maximum(infected + new_inf - new_dead - recovered, 0)
+            self.infected[idx] = now_infected
+            self.dead[idx] += new_dead
+            self.healthy[idx] = np.maximum(healthy - new_inf, 0)
+
+            self.total_infected += int(now_infected.sum() - infected.sum())
+            self.total_dead += int(new_dead.sum())
+            self.regions_hit -= int(np.count_nonzero(now_infected == 0))
+
+            # Discovery
+            hidden = ~self.discovered[idx]
+            if hidden.any():
+                chance = (infected[hidden] / pop[hidden]) * c.discover * self.balance["discovery"] * dt
+                found = self.np_rng.random(chance.size) < chance
+                self.discovered[idx[hidden][found]] = True
+                self.regions_discovered += int(np.count_nonzero(found))
+                if found.any():
+                    self._emit_regions(RegionDiscovered, idx[hidden][found].tolist())
+
+            self.infection_rate[idx] = infected / pop
+
+        # Cross-region spread
+        t = self.profiler.start()
+        self._cross_region_spread(dt)
+        self.profiler.stop("cross_spread", t)
+
+    def _cross_region_spread(self, dt):
+        """Seed other regions along the travel network."""
+        src = np.flatnonzero((self.infected > 100) & (self.population > 0))
+        if not src.size:
+            return
+
+        weight = self.infected[src] / self.population[src] * dt
+        targets, pressure = self.travel.pressure(self._route_rates()[0], src, weight)
+        fired = targets[self.np_rng.random(targets.size) < -np.expm1(-pressure)]
+        if not fired.size:
+            return
+
+        infected, healthy = self.infected, self.healthy
+        grow = fired[infected[fired] > 0]
+        new = fired[(infected[fired] == 0) & (healthy[fired] > 0)]
+        if new.size:
+            # Seed infection
+            seed = np.minimum(healthy[new], self.np_rng.integers(1, self._jump_seed[new], endpoint=True))
+            infected[new] = seed
+            healthy[new] -= seed
+            self.total_infected += int(seed.sum())
+            self.regions_hit += new.size
+            self._emit_regions(RegionInfected, new.tolist())
+        if grow.size:
+            cap = np.maximum(1, (healthy[grow] * 0.001).astype(np.int64))
+            extra = np.minimum(healthy[grow], self.np_rng.integers(1, cap, endpoint=True))
+            infected[grow] += extra
+            healthy[grow] -= extra
+            self.total_infected += int(extra.sum())
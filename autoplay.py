@@ -0,0 +1,260 @@
+"""
+Autoplay: gene purchases chosen by simulating them.
+
+At a decision point an Autoplayer rolls out every affordable gene purchase,
+and buying nothing, `horizon` days ahead `members` times each, and picks
+the candidate with the best mean score. It drives headless playtests and
+the in-game hint button.
+
+The rollouts run as one batch: a BatchRollout holds each (member,
+candidate) copy of the state as one row of (rows, regions) arrays and
+ticks them all together with the array engine's formulas. The candidates
+of a member share every random draw (common random numbers), so their
+scores differ by the purchase and not by the luck of the draw. The
+gene-derived factors come from evolution.gene_coefficients and the
+species' balance, as in the engines.
+
+    python -m game.autoplay br --days 730 --horizon 60 --members 8
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from game.evolution import EVOLVE_COST, GENE_DEFINITIONS, gene_coefficients
+
+GENE_KEYS = tuple(gkey for _, gkey, _, _ in GENE_DEFINITIONS)
+GENE_INDEX = {key: k for k, key in enumerate(GENE_KEYS)}
+TRAVEL_GENES = [GENE_INDEX[key] for key in ("transmission", "air_spread", "water_spread")]
+
+HORIZON = 60        # days per rollout
+MEMBERS = 8         # rollouts per candidate
+DECIDE_EVERY = 7    # days between decisions in headless games
+
+# Rollout score: share of the world infected or dead (deaths count double),
+# minus cure progress, minus a flat penalty if the cure was found
+DEAD_WEIGHT = 2.0
+CURE_WEIGHT = 1.0
+CURED_PENALTY = 1.0
+
+
+class BatchRollout:
+    """`members` copies of a species' state for each row of `genes`, ticked together."""
+
+    def __init__(self, species, genes, members=MEMBERS, seed=None):
+        genes = np.atleast_2d(np.asarray(genes, dtype=np.float64))
+        self.members = members
+        self.candidates = len(genes)
+        self.world = species.world
+        self.balance = species.balance
+        self.travel = travel = species.travel
+        self.rng = np.random.default_rng(seed)
+        self.days = 0
+
+        rows, n = members * self.candidates, len(self.world)
+        self.genes = np.tile(genes, (members, 1))
+        self.infected = np.tile(np.asarray(species.region_column("infected"), dtype=np.int64), (rows, 1))
+        self.dead = np.tile(np.asarray(species.region_column("dead"), dtype=np.int64), (rows, 1))
+        self.healthy = np.tile(np.asarray(species.region_column("healthy"), dtype=np.int64), (rows, 1))
+        self.discovered = np.tile(np.asarray(species.region_column("discovered"), dtype=bool), (rows, 1))
+        self.cure_progress = np.full(rows, float(species.cure_progress))
+        self.cured = np.full(rows, bool(species.cured))
+
+        world = self.world
+        self._pop = np.maximum(np.asarray(species.region_column("population"), dtype=np.int64), 1)
+        self._climate = np.array(world.climate, dtype=np.intp)
+        self._ports = np.array(world.ports, dtype=np.float64)
+        self._jump_seed = np.array(world.jump_seed, dtype=np.int64)
+        # Jump weights per edge of the transmission, air and water genes (see
+        # TravelNetwork.rates), with this game's closed routes zeroed
+        b = self.balance
+        self._edge_terms = np.stack([travel.generic * b["jump_generic"], travel.air * b["jump_air"],
+                                     travel.sea * b["jump_sea"]])
+        self._edge_terms[:, species.closed_routes] = 0.0
+        self._edge_target = (np.arange(rows)[:, None] * n + travel.indices).ravel()
+
+    def _draw(self, *shape):
+        """Uniform draws shared by all candidates of a member, one row each."""
+        return np.repeat(self.rng.random((self.members,) + shape), self.candidates, axis=0)
+
+    def run(self, days):
+        for _ in range(days):
+            if self.cured.all():
+                break
+            self.tick()
+
+    def tick(self, dt=1.0):
+        self.days += dt
+        active = ~self.cured
+        self._mutate(active, dt)
+        self._spread(active, dt)
+        self._cross_region_spread(active, dt)
+        self._cure_research(active, dt)
+
+    def _coefficients(self):
+        """Coefficients of every row's genes, as arrays of one value per row."""
+        return gene_coefficients({key: self.genes[:, k] for key, k in GENE_INDEX.items()},
+                                 self.balance, np.maximum)
+
+    def _mutate(self, active, dt):
+        """At most one gene per row nudged by U(-step, 2 * step), as Gene.mutate."""
+        b = self.balance
+        step = b["mutation_step"]
+        u = self._draw(3)
+        hit = np.flatnonzero(active & (u[:, 0] < self.genes[:, GENE_INDEX["mutation"]] * b["mutation"] * dt))
+        if hit.size:
+            k = np.minimum((u[hit, 1] * len(GENE_KEYS)).astype(np.intp), len(GENE_KEYS) - 1)
+            self.genes[hit, k] = np.clip(self.genes[hit, k] - step + 3 * step * u[hit, 2], 0.0, 1.0)
+
+    def _spread(self, active, dt):
+        c = self._coefficients()
+        climate_mods = np.stack(np.broadcast_arrays(*c.climate_mods), axis=1)
+        rate = c.trans[:, None] * climate_mods[:, self._climate]
+        rate += c.base[:, None]
+        rate += c.water[:, None] * self._ports
+
+        death = c.death * dt
+        recover = c.recover * dt * c.recover_stealth
+
+        infected, healthy = self.infected, self.healthy
+        live = (infected > 0) & (healthy > 0) & active[:, None]
+        new_inf = np.where(live, np.clip((infected * rate * (healthy / self._pop) * dt).astype(np.int64),
+                                         0, healthy), 0)
+        new_dead = np.where(live, (infected * death[:, None]).astype(np.int64), 0)
+        recovered = np.where(live, (infected * recover[:, None]).astype(np.int64), 0)
+
+        # Discovery, from the infections at the start of the tick
+        chance = infected / self._pop * (c.discover * self.balance["discovery"] * dt)[:, None]
+        self.discovered |= live & (self._draw(len(self.world)) < chance)
+
+        self.infected = np.maximum(infected + new_inf - new_dead - recovered, 0)
+        self.dead += new_dead
+        self.healthy = np.maximum(healthy - new_inf, 0)
+
+    def _cross_region_spread(self, active, dt):
+        travel = self.travel
+        infected, healthy = self.infected, self.healthy
+        weight = np.where((infected > 100) & active[:, None], infected / self._pop, 0.0) * dt
+        if not weight.any():
+            return
+        rates = self.genes[:, TRAVEL_GENES] @ self._edge_terms
+        pressure = np.bincount(self._edge_target, weights=(rates * weight[:, travel.sources]).ravel(),
+                               minlength=infected.size).reshape(infected.shape)
+        n = len(self.world)
+        fired = self._draw(n) < -np.expm1(-pressure)
+        if not fired.any():
+            return
+
+        # Seed new regions or add to an existing infection, as the engines do
+        u = self._draw(n)
+        seed = 1 + (u * self._jump_seed).astype(np.int64)
+        extra = 1 + (u * np.maximum(1, (healthy * 0.001).astype(np.int64))).astype(np.int64)
+        arrived = np.where(fired & (infected > 0), extra, np.where(fired & (healthy > 0), seed, 0))
+        arrived = np.minimum(arrived, healthy)
+        self.infected = infected + arrived
+        self.healthy = healthy - arrived
+
+    def _cure_research(self, active, dt):
+        speed = self.discovered.sum(axis=1) / len(self.world) * self.balance["cure_research"] * dt
+        speed *= self._coefficients().cure
+        self.cure_progress = np.where(active, np.minimum(1.0, self.cure_progress + speed), self.cure_progress)
+        self.cured |= self.cure_progress >= 1.0
+
+    def scores(self):
+        """Score of every rollout, as (members, candidates); higher is better for the pathogen."""
+        pop = self.world.total_population
+        score = (self.dead.sum(axis=1) * DEAD_WEIGHT + self.infected.sum(axis=1)) / pop
+        score -= self.cure_progress * CURE_WEIGHT + self.cured * CURED_PENALTY
+        return score.reshape(self.members, self.candidates)
+
+
+class Autoplayer:
+    """Picks gene purchases by batched rollouts of every candidate."""
+
+    def __init__(self, horizon=HORIZON, members=MEMBERS, amount=0.1, seed=None):
+        self.horizon = horizon
+        self.members = members
+        self.amount = amount
+        self.rng = np.random.default_rng(seed)
+
+    def candidates(self, species):
+        """None (keep the DNA) followed by every gene a purchase would still raise."""
+        if species.cured or species.dna_points < EVOLVE_COST:
+            return [None]
+        return [None] + [key for key, gene in species.genes.items() if gene.value < gene.max_val]
+
+    def evaluate(self, species):
+        """Mean rollout score per candidate, as {gene key or None: score}."""
+        keys = self.candidates(species)
+        genes = np.tile(np.array(species.genes.vector), (len(keys), 1))
+        for row, key in enumerate(keys):
+            if key is not None:
+                k = GENE_INDEX[key]
+                genes[row, k] = min(species.genes[key].max_val, genes[row, k] + self.amount)
+        batch = BatchRollout(species, genes, self.members, seed=int(self.rng.integers(2 ** 63)))
+        batch.run(self.horizon)
+        return dict(zip(keys, batch.scores().mean(axis=0).tolist()))
+
+    def choose(self, species):
+        """Best gene key to buy now, or None if keeping the DNA scores as well."""
+        if len(self.candidates(species)) == 1:
+            return None
+        scores = self.evaluate(species)
+        # None comes first, so it wins ties
+        return max(scores, key=scores.get)
+
+    def play(self, species):
+        """Buy genes while a purchase beats keeping the DNA; the keys bought."""
+        bought = []
+        while True:
+            key = self.choose(species)
+            if key is None or not species.evolve_gene(key, self.amount):
+                return bought
+            bought.append(key)
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+def main(argv=None):
+    from game.replay import engine_class, save_log
+    from game.sim import ENGINE_NAMES, stats_row, write_rows
+    from game.world_data import WORLD
+
+    parser = argparse.ArgumentParser(prog="python -m game.autoplay",
+                                     description="Headless game played by the autoplayer.")
+    parser.add_argument("origin")
+    parser.add_argument("--engine", choices=sorted(ENGINE_NAMES), default="array")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--horizon", type=int, default=HORIZON)
+    parser.add_argument("--members", type=int, default=MEMBERS)
+    parser.add_argument("--decide-every", type=int, default=DECIDE_EVERY, help="days between decisions")
+    parser.add_argument("--every", type=int, default=30, help="emit stats every N days")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--save-log", metavar="PATH", help="write the game's replay log")
+    args = parser.parse_args(argv)
+    if args.origin not in WORLD.index:
+        parser.error(f"unknown origin region: {args.origin}")
+
+    species = engine_class(ENGINE_NAMES[args.engine])("Patógeno X", args.origin, seed=args.seed)
+    player = Autoplayer(args.horizon, args.members, seed=args.seed)
+    rows = []
+    for day in range(args.days):
+        if day % max(1, args.decide_every) == 0:
+            for key in player.play(species):
+                print(f"day {day}: {key}", file=sys.stderr)
+        species.tick(dt_days=1.0)
+        if species.cured or (day + 1) % max(1, args.every) == 0:
+            rows.append(stats_row(species))
+        if species.cured:
+            break
+
+    write_rows(rows, sys.stdout, args.format)
+    if args.save_log:
+        save_log(species, args.save_log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
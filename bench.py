@@ -0,0 +1,200 @@
+"""
+Benchmarks for the simulation hot paths.
+
+Runs PathogenSpecies.tick and its phases on synthetic worlds that follow the
+world_data.REGIONS schema, early game (only the origin infected) and late
+game (every region infected), and writes calls/sec and allocated bytes per
+call to a JSON file that later runs can be compared against:
+
+    python -m game.bench -o bench.json
+    python -m game.bench --sizes 20,2000 --baseline bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from game.replay import engine_class
+from game.sim import ENGINE_NAMES
+from game.world_data import CLIMATES, WorldIndex
+
+BENCH_VERSION = 2
+SIZES = (20, 200, 2_000, 20_000)
+PHASES = ("early", "late")
+OPS = ("tick", "_spread", "_cross_region_spread", "_cure_research", "get_stats")
+CONTINENT_COUNT = 8
+
+
+def synthetic_regions(n, seed=0):
+    """n regions laid out on a grid in the unit square, REGIONS schema."""
+    rng = random.Random(seed)
+    cols = max(1, int(n ** 0.5 + 0.999))
+    cell = 1.0 / cols
+    regions = []
+    for i in range(n):
+        cx = (i % cols + 0.5) * cell
+        cy = (i // cols + 0.5) * cell
+        h = cell * 0.45
+        regions.append({
+            "id": f"r{i:05d}", "name": f"Região {i}",
+            "continent": f"Continente {i * CONTINENT_COUNT // n}",
+            "pop": rng.randint(1, 60), "climate": rng.choice(CLIMATES),
+            "gdp": rng.randint(1, 3), "ports": rng.randint(0, 3), "airports": rng.randint(0, 3),
+            "color_base": (rng.random(), rng.random(), rng.random()),
+            "center": (cx, cy),
+            "poly": [cx - h, cy - h, cx + h, cy - h, cx + h, cy + h, cx - h, cy + h],
+        })
+    return regions
+
+
+def make_species(engine, world, phase, seed=0):
+    species = engine_class(ENGINE_NAMES[engine])("bench", world.ids[0], world=world, seed=seed)
+    for g in species.genes.values():
+        g.value = 0.5
+    if phase == "late":
+        rng = random.Random(seed)
+        for rid in world.ids:
+            state = species.regions[rid]
+            pop = state["population"]
+            infected = int(pop * rng.uniform(0.1, 0.5))
+            state["infected"] = infected
+            state["dead"] = int(pop * rng.uniform(0.0, 0.1))
+            state["healthy"] = pop - infected - state["dead"]
+            state["discovered"] = rng.random() < 0.5
+        species._recount()
+    # Gene-derived caches built once here are shared by every fork measured
+    species._coefficients()
+    species._route_rates()
+    return species
+
+
+def _call(template, op):
+    """The op bound to a fresh fork of `template`, so every call starts from
+    the template's state instead of where the previous call left it."""
+    species = template.fork()
+    if op == "get_stats":
+        species._stats = None  # cached until the next tick; measure computing it
+        return species.get_stats
+    if op in ("_spread", "_cross_region_spread", "_cure_research", "tick"):
+        method = getattr(species, op)
+        return lambda: method(1.0)
+    raise ValueError(f"unknown op: {op}")
+
+
+def measure(template, op, min_time=0.2, max_calls=10_000):
+    """(calls, seconds per call, allocated bytes per call) for one op.
+
+    Only the op is timed. Forking the state for each call is not, but it
+    counts against a wall-clock cap of 20 x min_time.
+    """
+    _call(template, op)()  # warm caches
+
+    calls = 0
+    elapsed = 0.0
+    deadline = time.perf_counter() + min_time * 20
+    while elapsed < min_time and calls < max_calls and (not calls or time.perf_counter() < deadline):
+        call = _call(template, op)
+        t0 = time.perf_counter()
+        call()
+        elapsed += time.perf_counter() - t0
+        calls += 1
+
+    # Transient allocation: traced peak above the pre-call level, averaged
+    samples = min(calls, 20)
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(samples):
+        call = _call(template, op)
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        call()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return calls, elapsed / calls, allocated / samples
+
+
+def run(sizes=SIZES, engines=tuple(ENGINE_NAMES), phases=PHASES, ops=OPS, min_time=0.2, log=None):
+    results = []
+    for n in sizes:
+        world = WorldIndex(synthetic_regions(n))
+        for engine in engines:
+            for phase in phases:
+                for op in ops:
+                    template = make_species(engine, world, phase)
+                    calls, sec, alloc = measure(template, op, min_time)
+                    row = {
+                        "engine": engine, "regions": n, "phase": phase, "op": op,
+                        "calls": calls, "sec_per_call": sec, "calls_per_sec": 1 / sec,
+                        "alloc_bytes_per_call": alloc,
+                    }
+                    results.append(row)
+                    if log:
+                        log(row)
+    return results
+
+
+def compare(results, baseline):
+    """Yield (row, speedup vs baseline) for rows present in both runs."""
+    key = lambda r: (r["engine"], r["regions"], r["phase"], r["op"])
+    base = {key(r): r for r in baseline["results"]}
+    for row in results:
+        old = base.get(key(row))
+        if old:
+            yield row, old["sec_per_call"] / row["sec_per_call"]
+
+
+def _print_row(row, speedup=None):
+    line = (f"{row['engine']:>5} {row['regions']:>6} {row['phase']:>5} {row['op']:<22}"
+            f"{row['calls_per_sec']:>12.1f}/s {row['alloc_bytes_per_call'] / 1024:>10.1f} KiB")
+    if speedup is not None:
+        line += f"  x{speedup:.2f}"
+    print(line, file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--engines", default=",".join(ENGINE_NAMES))
+    parser.add_argument("--phases", default=",".join(PHASES))
+    parser.add_argument("--ops", default=",".join(OPS))
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    parser.add_argument("-o", "--output", default="bench.json")
+    parser.add_argument("--baseline", help="earlier output to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.0,
+                        help="exit 1 if any op is slower than baseline by more than this fraction")
+    args = parser.parse_args(argv)
+
+    results = run(
+        sizes=[int(s) for s in args.sizes.split(",")],
+        engines=args.engines.split(","),
+        phases=args.phases.split(","),
+        ops=args.ops.split(","),
+        min_time=args.min_time,
+        log=None if args.baseline else _print_row,
+    )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": BENCH_VERSION,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }, f, indent=1)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for row, speedup in compare(results, baseline):
+            _print_row(row, speedup)
+            if args.max_regression and speedup < 1 - args.max_regression:
+                status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
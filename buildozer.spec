@@ -4,12 +4,12 @@ package.name    = evolucaoreal
 package.domain  = com.evolucaoreal
 
 source.dir      = .
-source.include_exts = py,png,jpg,kv,atlas,json
+source.include_exts = py,png,jpg,kv,atlas,json,pwld
 source.include_patterns = game/*.py
 
 version         = 2.0.0
 
-requirements    = python3,kivy==2.3.0
+requirements    = python3,kivy==2.3.0,numpy
 
 orientation     = portrait
 
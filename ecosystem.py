@@ -0,0 +1,295 @@
+"""
+Several pathogen species competing for one host population.
+
+A PathogenSpecies owns a private copy of every region's hosts, so two of
+them would each infect the same people. An Ecosystem owns the hosts once
+(`healthy` per region) and keeps S species as a struct of arrays:
+
+- infected, dead, discovered: shape (species, regions)
+- genes: shape (species, genes), columns in GENE_DEFINITIONS order
+- cure progress, DNA points, lineage: one entry per species
+
+A tick is a fixed sequence of array operations over all species at once.
+When the species together want more new hosts in a region than it has
+healthy people left, each gets a share proportional to its demand.
+Speciation splits the infections of one species on one continent off into
+a new species row with drifted genes.
+"""
+
+import random
+
+import numpy as np
+
+from game.evolution import BALANCE, EVOLVE_COST, GENE_DEFINITIONS
+from game.travel import travel_network
+from game.world_data import WORLD
+
+GENE_KEYS = tuple(gkey for _, gkey, _, _ in GENE_DEFINITIONS)
+GENE_INDEX = {key: k for k, key in enumerate(GENE_KEYS)}
+STARTER_GENES = {"transmission": 0.15, "stealth": 0.20}
+
+MAX_SPECIES = 16
+SPECIATION_MIN_REGIONS = 3   # regions a species must hold before it can split
+SPECIATION_RATE = 0.002      # splits per day at mutation gene 1.0
+SPECIATION_DRIFT = 0.1       # stddev of the gene drift of a new species
+
+
+def share_hosts(demand, available):
+    """Integer allocations of `available` hosts per region, proportional to
+    each species' `demand` (species, regions) and never exceeding supply."""
+    total = demand.sum(axis=0)
+    scale = np.divide(available, total, out=np.ones_like(total, dtype=np.float64),
+                      where=total > available)
+    return (demand * scale).astype(np.int64)
+
+
+class Ecosystem:
+    """World-level simulation of competing species on shared hosts."""
+
+    def __init__(self, world=None, seed=None):
+        world = self.world = WORLD if world is None else world
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = np.random.default_rng(self.seed)
+        self.travel = travel_network(world)
+        self.balance = BALANCE
+        self.age_days = 0
+        self.tick_count = 0
+
+        n = len(world)
+        self.population = np.array(world.population, dtype=np.int64)
+        self.healthy = self.population.copy()
+        self._pop = np.maximum(self.population, 1)
+        self._climate = np.array(world.climate, dtype=np.intp)
+        self._ports = np.array(world.ports, dtype=np.float64)
+        self._jump_seed = np.array(world.jump_seed, dtype=np.int64)
+        self._continent = np.zeros(n, dtype=np.intp)
+        for k, regions in enumerate(world.continents.values()):
+            self._continent[list(regions)] = k
+
+        self.names = []
+        self.parent = np.empty(0, dtype=np.int64)      # -1 for founders
+        self.genes = np.empty((0, len(GENE_KEYS)))
+        self.infected = np.empty((0, n), dtype=np.int64)
+        self.dead = np.empty((0, n), dtype=np.int64)
+        self.discovered = np.empty((0, n), dtype=bool)
+        self.cure_progress = np.empty(0)
+        self.dna_points = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def gene(self, key):
+        """Column view of one gene across all species."""
+        return self.genes[:, GENE_INDEX[key]]
+
+    @property
+    def cured(self):
+        return self.cure_progress >= 1.0
+
+    @property
+    def alive(self):
+        return self.infected.any(axis=1) & ~self.cured
+
+    # ── Species rows ─────────────────────────────────────────
+    def _append(self, names, genes, infected, parents):
+        """Add one species row per name, stacking every state array once;
+        returns the new indices."""
+        k, n = len(names), len(self.world)
+        first = len(self.names)
+        self.names.extend(names)
+        self.parent = np.concatenate([self.parent, np.asarray(parents, dtype=np.int64)])
+        self.genes = np.vstack([self.genes, genes])
+        self.infected = np.vstack([self.infected, infected])
+        self.dead = np.vstack([self.dead, np.zeros((k, n), dtype=np.int64)])
+        self.discovered = np.vstack([self.discovered, np.zeros((k, n), dtype=bool)])
+        self.cure_progress = np.concatenate([self.cure_progress, np.zeros(k)])
+        self.dna_points = np.concatenate([self.dna_points, np.full(k, 10, dtype=np.int64)])
+        return np.arange(first, first + k)
+
+    def add_species(self, name, origin_region_id):
+        """Seed a new founding species at a region; returns its index."""
+        if len(self) >= MAX_SPECIES:
+            raise ValueError(f"at most {MAX_SPECIES} species")
+        i = self.world.index[origin_region_id]
+        genes = np.zeros(len(GENE_KEYS))
+        for key, value in STARTER_GENES.items():
+            genes[GENE_INDEX[key]] = value
+        infected = np.zeros(len(self.world), dtype=np.int64)
+        infected[i] = min(self.healthy[i], self.world.origin_seed[i])
+        self.healthy[i] -= infected[i]
+        return int(self._append([name], genes[None], infected[None], [-1])[0])
+
+    def speciate(self, s, regions=None, name=None):
+        """Split species `s`: its infections in `regions` (a bool mask over
+        regions; default one continent it occupies) become a new species
+        with drifted genes. Returns the new index, or None if nothing splits."""
+        if len(self) >= MAX_SPECIES:
+            return None
+        split = np.array([s])
+        regions = self._isolated(split) if regions is None else regions[None, :]
+        new = self._split(split, regions, None if name is None else [name])
+        return int(new[0]) if new.size else None
+
+    def _isolated(self, split):
+        """Geographic isolation: per species in `split`, a mask of one random
+        continent it occupies, as (species, regions)."""
+        present = self.infected[split] > 0
+        count = np.count_nonzero(present, axis=1)
+        pick = (self.rng.random(len(split)) * count).astype(np.int64)
+        region = np.argmax(np.cumsum(present, axis=1) > pick[:, None], axis=1)
+        return self._continent[None, :] == self._continent[region][:, None]
+
+    def _split(self, split, regions, names=None):
+        """Split each species in `split` (distinct indices) along its row of
+        `regions`; species that would not divide are skipped. New indices."""
+        present = self.infected[split] > 0
+        moved = present & regions
+        ok = moved.any(axis=1) & (present & ~regions).any(axis=1)
+        split, moved = split[ok], moved[ok]
+        if names is not None:
+            names = [name for name, keep in zip(names, ok) if keep]
+        if not split.size:
+            return split
+
+        child = np.where(moved, self.infected[split], 0)
+        self.infected[split] -= child
+        drift = self.rng.normal(0.0, SPECIATION_DRIFT, (len(split), len(GENE_KEYS)))
+        genes = np.clip(self.genes[split] + drift, 0.0, 1.0)
+        if names is None:
+            names = [f"{self.names[s]}-{int(np.count_nonzero(self.parent == s)) + 2}" for s in split]
+        return self._append(names, genes, child, split)
+
+    def evolve_gene(self, s, gene_key, amount=0.1):
+        if self.dna_points[s] >= EVOLVE_COST:
+            k = GENE_INDEX[gene_key]
+            self.genes[s, k] = min(1.0, self.genes[s, k] + amount)
+            self.dna_points[s] -= EVOLVE_COST
+            return True
+        return False
+
+    # ── Simulation ───────────────────────────────────────────
+    def tick(self, dt_days=1.0):
+        """Advance every species by dt_days."""
+        self.age_days += dt_days
+        self.tick_count += 1
+        if not len(self):
+            return
+        self._mutate(dt_days)
+        self._spread(dt_days)
+        self._cross_region_spread(dt_days)
+        self._cure_research(dt_days)
+        self._speciation(dt_days)
+
+    def _mutate(self, dt):
+        s = len(self)
+        rng = self.rng
+        b = self.balance
+        hit = np.flatnonzero(self.alive & (rng.random(s) < self.gene("mutation") * b["mutation"] * dt))
+        if not hit.size:
+            return
+        k = rng.integers(0, len(GENE_KEYS), hit.size)
+        step = b["mutation_step"]
+        self.genes[hit, k] = np.clip(self.genes[hit, k] + rng.uniform(-step, 2 * step, hit.size), 0.0, 1.0)
+        self.dna_points[hit] += self.dna_points[hit] < 50
+
+    def _spread(self, dt):
+        b = self.balance
+        g = self.gene
+        infected = self.infected
+        heat, cold = g("heat_resist"), g("cold_resist")
+        climate_mods = np.stack([np.ones(len(self)), 1 + heat * b["tropical_heat"], 1 + cold * b["cold_cold"],
+                                 b["arid_base"] + heat * b["arid_heat"]], axis=1)
+
+        # Spread rate per (species, region), as in PathogenSpecies._spread
+        rate = g("transmission")[:, None] * b["spread"] * climate_mods[:, self._climate]
+        rate += (g("air_spread") * b["air_spread"] + g("animal_host") * b["animal_spread"])[:, None]
+        rate += g("water_spread")[:, None] * b["water_spread"] * self._ports
+
+        # Competition: all species draw on the same healthy hosts
+        demand = infected * rate * (self.healthy / self._pop) * dt
+        new_inf = share_hosts(demand, self.healthy)
+
+        new_dead = (infected * (g("lethality") * b["lethality"] * dt)[:, None]).astype(np.int64)
+        recover = np.maximum(b["recovery_min"], b["recovery"] - g("resistance") * b["recovery_resistance"]) \
+            * dt * (1 - g("stealth") * b["stealth_recovery"])
+        recovered = (infected * recover[:, None]).astype(np.int64)
+
+        # Discovery, from the infections at the start of the tick
+        discover = (1 - g("stealth") * b["stealth_discovery"]) * b["discovery"] * dt
+        chance = infected / self._pop * discover[:, None]
+        self.discovered |= (infected > 0) & (self.rng.random(infected.shape) < chance)
+
+        self.infected = np.maximum(infected + new_inf - new_dead - recovered, 0)
+        self.dead += new_dead
+        self.healthy -= new_inf.sum(axis=0)
+
+    def _cross_region_spread(self, dt):
+        """Seed other regions along the travel network, all species in one pass."""
+        travel = self.travel
+        s, n = self.infected.shape
+        owner, src = np.nonzero(self.infected > 100)
+        if not owner.size:
+            return
+
+        # Gather the out-edges of every (species, source) pair; rates are
+        # only evaluated on those edges, for the owning species' genes
+        b = self.balance
+        g = self.gene
+        edges, count = travel.out_edges(src)
+        owner = np.repeat(owner, count)
+        rates = (g("transmission")[owner] * b["jump_generic"] * travel.generic[edges]
+                 + g("air_spread")[owner] * b["jump_air"] * travel.air[edges]
+                 + g("water_spread")[owner] * b["jump_sea"] * travel.sea[edges])
+        weight = self.infected[owner, travel.sources[edges]] / self._pop[travel.sources[edges]] * dt
+        pressure = np.bincount(owner * n + travel.indices[edges], weights=rates * weight,
+                               minlength=s * n).reshape(s, n)
+        rng = self.rng
+        fired = rng.random((s, n)) < -np.expm1(-pressure)
+        if not fired.any():
+            return
+
+        # Seed new regions, or add to an existing infection, as in the engines
+        seed = rng.integers(1, self._jump_seed, endpoint=True, size=(s, n))
+        cap = np.maximum(1, (self.healthy * 0.001).astype(np.int64))
+        extra = rng.integers(1, cap, endpoint=True, size=(s, n))
+        want = np.where(fired, np.where(self.infected > 0, extra, seed), 0)
+        arrived = share_hosts(want, self.healthy)
+        self.infected += arrived
+        self.healthy -= arrived.sum(axis=0)
+
+    def _cure_research(self, dt):
+        """Each species is researched separately, faster the more regions found it."""
+        b = self.balance
+        g = self.gene
+        speed = self.discovered.sum(axis=1) / len(self.world) * b["cure_research"] * dt
+        speed *= (1 - g("stealth") * b["stealth_cure"]) * (1 - g("resistance") * b["resistance_cure"])
+        was_cured = self.cured
+        self.cure_progress = np.minimum(1.0, self.cure_progress + speed)
+        self.infected[self.cured & ~was_cured] = 0
+
+    def _speciation(self, dt):
+        spread = np.count_nonzero(self.infected, axis=1) >= SPECIATION_MIN_REGIONS
+        chance = self.gene("mutation") * SPECIATION_RATE * dt
+        split = np.flatnonzero(spread & ~self.cured & (self.rng.random(len(self)) < chance))
+        split = split[:MAX_SPECIES - len(self)]
+        if split.size:
+            self._split(split, self._isolated(split))
+
+    # ── Stats ────────────────────────────────────────────────
+    def get_stats(self):
+        """Totals per species, in species order."""
+        world_pop = self.world.total_population
+        infected = self.infected.sum(axis=1)
+        dead = self.dead.sum(axis=1)
+        hit = np.count_nonzero(self.infected, axis=1)
+        return [{
+            "name": name,
+            "parent": int(self.parent[s]),
+            "infected": int(infected[s]),
+            "dead": int(dead[s]),
+            "infected_pct": float(infected[s] / world_pop * 100) if world_pop > 0 else 0,
+            "dead_pct": float(dead[s] / world_pop * 100) if world_pop > 0 else 0,
+            "regions_hit": int(hit[s]),
+            "cure_pct": float(self.cure_progress[s]) * 100,
+            "dna_points": int(self.dna_points[s]),
+        } for s, name in enumerate(self.names)]
@@ -0,0 +1,60 @@
+"""
+Typed simulation events.
+
+A species appends events to its `events` queue while it ticks: a region's
+first infection by a route jump, a region discovering the pathogen, a
+spontaneous mutation, cure-research and death-toll milestones and the cure
+itself. The queue is a bounded deque (append and popleft are atomic, so the
+simulation thread never takes a lock); if nobody drains it the oldest
+events are dropped.
+
+Consumers subscribe per event type on an EventBus, which the UI drains once
+per frame, so each reacts to what happened instead of diffing the state.
+"""
+
+from collections import deque, namedtuple
+
+EVENT_QUEUE_SIZE = 512
+MAX_EVENTS_PER_FRAME = 64
+
+# Cure progress is reported every 10 %; deaths when the toll passes each of
+# these, the last being the game's win condition
+CURE_MILESTONES = 10
+WIN_DEAD = 7_500_000_000
+DEATH_MILESTONES = (1_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000,
+                    2_500_000_000, 5_000_000_000, WIN_DEAD)
+
+RegionInfected = namedtuple("RegionInfected", "day region")
+RegionDiscovered = namedtuple("RegionDiscovered", "day region")
+Mutation = namedtuple("Mutation", "day gene value")
+CureMilestone = namedtuple("CureMilestone", "day percent")
+Cured = namedtuple("Cured", "day")
+DeathMilestone = namedtuple("DeathMilestone", "day milestone dead")
+
+
+def event_queue():
+    return deque(maxlen=EVENT_QUEUE_SIZE)
+
+
+class EventBus:
+    """Event-type -> subscriber callbacks, fed from an event queue."""
+
+    def __init__(self):
+        self._subscribers = {}
+
+    def subscribe(self, event_type, callback):
+        self._subscribers.setdefault(event_type, []).append(callback)
+
+    def dispatch(self, queue, until_day=None, limit=MAX_EVENTS_PER_FRAME):
+        """Pop and deliver up to `limit` events, stopping at the first one after
+        `until_day` (e.g. a day the UI has not shown yet). Number delivered."""
+        delivered = 0
+        while queue and delivered < limit:
+            event = queue[0]
+            if until_day is not None and event.day > until_day:
+                break
+            queue.popleft()
+            for callback in self._subscribers.get(type(event), ()):
+                callback(event)
+            delivered += 1
+        return delivered
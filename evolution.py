@@ -1,23 +1,81 @@
+import copy
 import random
 import math
-from game.world_data import REGIONS, WORLD_TOTAL_POP
+import time
+from array import array
+from collections import namedtuple
+from collections.abc import Mapping
+from types import MappingProxyType
+import numpy as np
+from game.world_data import WORLD
+from game.profiling import NULL_PROFILER
+from game.events import (CURE_MILESTONES, DEATH_MILESTONES, Cured, CureMilestone, DeathMilestone,
+                         Mutation, RegionDiscovered, RegionInfected, event_queue)
+from game.travel import travel_network
+
+# Fast-forward step sizing (see PathogenSpecies.advance)
+ADVANCE_TOLERANCE = 0.1     # max relative change of a region's infected per step
+ADVANCE_MAX_CHANCE = 0.5    # max probability of any random event per step
+ADVANCE_MAX_STEP = 30       # days
+
+# Per-region state that saves and forks carry, as (field, dtype)
+REGION_ARRAYS = (("infected", np.int64), ("dead", np.int64), ("healthy", np.int64),
+                 ("infection_rate", np.float64), ("discovered", np.bool_))
+COLUMN_DTYPES = dict(REGION_ARRAYS, population=np.int64)
+
+EVOLVE_COST = 2   # DNA points per gene purchase
 
 
 class Gene:
-    def __init__(self, name, key, min_val=0.0, max_val=1.0, desc="", icon="🧬"):
+    """One gene of a species; the value lives in the species' GeneSet array."""
+
+    __slots__ = ("name", "key", "min_val", "max_val", "desc", "icon", "version",
+                 "_values", "_index", "_owner")
+
+    def __init__(self, name, key, min_val=0.0, max_val=1.0, desc="", icon="🧬",
+                 owner=None, index=0):
         self.name = name
         self.key = key
-        self.value = 0.0
         self.min_val = min_val
         self.max_val = max_val
         self.desc = desc
         self.icon = icon
-
-    def mutate(self, amount=0.05):
-        self.value = max(self.min_val, min(self.max_val, self.value + random.uniform(-amount, amount * 2)))
+        self.version = 0  # bumped whenever value changes, so the UI can skip redraws
+        self._owner = owner
+        self._values = array("d", [0.0]) if owner is None else owner.vector
+        self._index = index
+
+    @property
+    def value(self):
+        return self._values[self._index]
+
+    @value.setter
+    def value(self, value):
+        # Direct assignment (setup, restore) keeps the UI version but still
+        # invalidates the species' coefficient cache
+        self._values[self._index] = value
+        if self._owner is not None:
+            self._owner.version += 1
+
+    def mutate(self, amount=0.05, rng=random):
+        self._set(max(self.min_val, min(self.max_val, self.value + rng.uniform(-amount, amount * 2))))
 
     def evolve(self, points=0.1):
-        self.value = min(self.max_val, self.value + points)
+        self._set(min(self.max_val, self.value + points))
+
+    def _set(self, value):
+        if value != self.value:
+            self.value = value
+            self.version += 1
+
+    def _bind(self, owner):
+        """Copy of this gene reading its value from `owner`'s array."""
+        gene = Gene.__new__(Gene)
+        for name in Gene.__slots__:
+            setattr(gene, name, getattr(self, name))
+        gene._owner = owner
+        gene._values = owner.vector
+        return gene
 
 
 GENE_DEFINITIONS = [
@@ -34,120 +92,414 @@ GENE_DEFINITIONS = [
 ]
 
 
+class GeneSet(Mapping):
+    """Genes of one species by key, with all values in one fixed-layout array.
+
+    `version` changes whenever any value does, so gene-derived coefficients
+    can be cached against it.
+    """
+
+    __slots__ = ("vector", "version", "_genes")
+
+    def __init__(self):
+        self.vector = array("d", [0.0] * len(GENE_DEFINITIONS))
+        self.version = 0
+        self._genes = {gkey: Gene(gname, gkey, desc=gdesc, icon=gicon, owner=self, index=k)
+                       for k, (gname, gkey, gdesc, gicon) in enumerate(GENE_DEFINITIONS)}
+
+    def __getitem__(self, key):
+        return self._genes[key]
+
+    def __iter__(self):
+        return iter(self._genes)
+
+    def __len__(self):
+        return len(self._genes)
+
+    def copy(self):
+        """Independent GeneSet with the same values and versions."""
+        genes = GeneSet.__new__(GeneSet)
+        genes.vector = array("d", self.vector)
+        genes.version = self.version
+        genes._genes = {key: gene._bind(genes) for key, gene in self._genes.items()}
+        return genes
+
+
+# Model constants of the tick formulas. Engines read them from
+# species.balance, so balance sweeps (game.sweep) can override them per run.
+BALANCE = MappingProxyType({
+    "spread": 0.08,               # within-region spread per transmission
+    "air_spread": 0.04,
+    "water_spread": 0.01,         # per port
+    "animal_spread": 0.02,
+    "lethality": 0.005,           # deaths per infected per day at lethality 1
+    "recovery": 0.01,             # recoveries per infected per day at resistance 0
+    "recovery_resistance": 0.009,
+    "recovery_min": 0.002,
+    "cure_research": 0.002,       # cure progress per day with every region aware
+    "tropical_heat": 0.5,         # climate spread bonuses per heat/cold gene
+    "cold_cold": 0.5,
+    "arid_base": 0.7,
+    "arid_heat": 0.6,
+    "jump_generic": 0.03,         # route jumps per day per travel gene, by route kind
+    "jump_air": 0.06,
+    "jump_sea": 0.02,
+    "discovery": 0.3,             # discovery chance per day at infected share 1
+    "stealth_recovery": 0.3,      # stealth reductions of recovery, discovery and cure research
+    "stealth_discovery": 0.8,
+    "stealth_cure": 0.4,
+    "resistance_cure": 0.5,       # resistance reduction of cure research
+    "mutation": 0.1,              # spontaneous mutations per day at mutation gene 1
+    "mutation_step": 0.03,        # a mutation moves a gene by U(-step, 2 * step)
+})
+
+# Gene-derived factors of the spread, death, recovery and cure formulas
+Coefficients = namedtuple("Coefficients", [
+    "climate_mods",   # spread multiplier per climate code
+    "spread",         # per-region within-region spread rate, in world order
+    "trans",          # transmission * spread
+    "base",           # air + animal spread terms
+    "water",          # water spread per port
+    "death",          # deaths per infected per day
+    "recover",        # recoveries per infected per day, before stealth
+    "recover_stealth",
+    "discover",       # discovery factor from stealth
+    "cure",           # cure research factor from stealth and resistance
+])
+
+
+def gene_coefficients(values, b, maximum=max):
+    """Coefficients of gene `values` under balance `b`, without the per-region
+    spread. Values may be floats, or arrays of one value per row with
+    maximum=np.maximum (see autoplay.BatchRollout)."""
+    trans = values["transmission"]
+    resist = values["resistance"]
+    stealth = values["stealth"]
+    heat = values["heat_resist"]
+    cold = values["cold_resist"]
+    return Coefficients(
+        climate_mods=(1.0, 1.0 + heat * b["tropical_heat"], 1.0 + cold * b["cold_cold"],
+                      b["arid_base"] + heat * b["arid_heat"]),
+        spread=None,
+        trans=trans * b["spread"],
+        base=values["air_spread"] * b["air_spread"] + values["animal_host"] * b["animal_spread"],
+        water=values["water_spread"] * b["water_spread"],
+        death=values["lethality"] * b["lethality"],
+        recover=maximum(b["recovery_min"], b["recovery"] - resist * b["recovery_resistance"]),
+        recover_stealth=1 - stealth * b["stealth_recovery"],
+        discover=1 - stealth * b["stealth_discovery"],
+        cure=(1 - stealth * b["stealth_cure"]) * (1 - resist * b["resistance_cure"]),
+    )
+
+
 class PathogenSpecies:
-    def __init__(self, name, origin_region_id):
+    def __init__(self, name, origin_region_id, world=None, seed=None):
         self.name = name
+        self.world = WORLD if world is None else world
         self.origin_id = origin_region_id
+
+        # Own RNG stream: same seed + same input log = same run
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.tick_count = 0
+        self.input_log = []
+        self.profiler = NULL_PROFILER
+        # Optional recorder with a record(species) method, called after every tick
+        self.history = None
+        # game.events appended during ticks, for the UI to drain
+        self.events = event_queue()
+
         self.age_days = 0
         self.dna_points = 10
         self.evolved_traits = []
+        # Running aggregates, updated by deltas as region state changes
         self.total_infected = 0
         self.total_dead = 0
+        self.regions_hit = 0
+        self.regions_discovered = 0
+        self._stats = None
+        self.version = 0
         self.cured = False
         self.cure_progress = 0.0
 
         # Genes
-        self.genes = {}
-        for gname, gkey, gdesc, gicon in GENE_DEFINITIONS:
-            self.genes[gkey] = Gene(gname, gkey, desc=gdesc, icon=gicon)
+        self.genes = GeneSet()
+        self.balance = BALANCE
+        self._coeff_version = None
+        self._coeff = None
 
         # Starter: slight transmission
         self.genes["transmission"].value = 0.15
         self.genes["stealth"].value = 0.20
 
+        # Travel routes are shared per world; closures belong to this game
+        self.travel = travel_network(self.world)
+        self.closed_routes = np.zeros(self.travel.size, dtype=bool)
+        self._routes_version = 0
+        self._route_key = None
+        self._route_cache = None
+
         # Region infection states
+        self._init_regions(origin_region_id)
+
+    def _init_regions(self, origin_region_id):
+        world = self.world
         self.regions = {}
-        for r in REGIONS:
-            self.regions[r["id"]] = {
+        for rid, pop in zip(world.ids, world.population):
+            self.regions[rid] = {
                 "infected": 0,
                 "dead": 0,
-                "population": r["pop"] * 1_000_000,
-                "healthy": r["pop"] * 1_000_000,
+                "population": pop,
+                "healthy": pop,
                 "infection_rate": 0.0,
                 "discovered": False,
             }
+        self._states = tuple(self.regions.values())
 
         # Seed origin
         origin = self.regions[origin_region_id]
-        seed = max(1, int(origin["population"] * 0.0001))
+        seed = world.origin_seed[world.index[origin_region_id]]
         origin["infected"] = seed
         origin["healthy"] -= seed
         origin["discovered"] = False
+        self._recount()
+
+    def _recount(self):
+        """Rebuild the running aggregates from region state (O(regions))."""
+        states = self.regions.values()
+        self.total_infected = sum(s["infected"] for s in states)
+        self.total_dead = sum(s["dead"] for s in states)
+        self.regions_hit = sum(1 for s in states if s["infected"] > 0)
+        self.regions_discovered = sum(1 for s in states if s["discovered"])
+        self._changed()
+
+    def export_regions(self):
+        """Copies of the per-region state as arrays, one per REGION_ARRAYS field.
+
+        One pass over the region dicts here; the array engines only copy.
+        """
+        states, n = self._states, len(self._states)
+        return {field: np.fromiter((s[field] for s in states), dtype=dtype, count=n)
+                for field, dtype in REGION_ARRAYS}
+
+    def region_column(self, field):
+        """One per-region state field as an array, in world order (treat as read-only)."""
+        states = self._states
+        return np.fromiter((s[field] for s in states), dtype=COLUMN_DTYPES[field], count=len(states))
+
+    def import_regions(self, arrays):
+        """Replace the per-region state with export_regions()-style arrays
+        (one pass over the region dicts here)."""
+        for field, _ in REGION_ARRAYS:
+            for s, value in zip(self._states, arrays[field].tolist()):
+                s[field] = value
+        self._recount()
+
+    def fork(self):
+        """Independent copy of the game at this point, for what-if rollouts.
+
+        Copies the per-region state (region dicts here, arrays in the array
+        engines), genes and RNG streams; the world, travel network and
+        gene-derived caches are shared until the fork changes them. The fork
+        records no history, uses no profiler and starts with an empty event
+        queue. Rollouts that only need arrays can restore an array-engine
+        copy from savegame.capture() instead (see SimulationRunner.hint).
+        """
+        twin = copy.copy(self)
+        twin.genes = self.genes.copy()
+        twin.rng = copy.copy(self.rng)
+        twin.input_log = list(self.input_log)
+        twin.evolved_traits = list(self.evolved_traits)
+        twin.closed_routes = self.closed_routes.copy()
+        twin.history = None
+        twin.profiler = NULL_PROFILER
+        twin.events = event_queue()
+        self._fork_regions(twin)
+        return twin
+
+    def _fork_regions(self, twin):
+        twin.regions = {rid: dict(s) for rid, s in self.regions.items()}
+        twin._states = tuple(twin.regions.values())
+
+    def _changed(self):
+        """Invalidate cached stats and bump the version the UI compares against."""
+        self._stats = None
+        self.version += 1
 
     def tick(self, dt_days=1.0):
         """Advance simulation by dt_days."""
+        prof = self.profiler
+        t_tick = prof.start()
         self.age_days += dt_days
+        self.tick_count += 1
+        self._changed()
+        dead, cure = self.total_dead, self.cure_progress
 
         # Auto-mutate based on mutation gene
-        if random.random() < self.genes["mutation"].value * 0.1 * dt_days:
-            key = random.choice(list(self.genes.keys()))
-            self.genes[key].mutate(0.03)
-            if self.dna_points < 50:
-                self.dna_points += 1
+        t = prof.start()
+        self._mutate(dt_days)
+        prof.stop("mutation", t)
 
         # Spread within and between regions
+        t = prof.start()
         self._spread(dt_days)
+        prof.stop("spread", t)
 
         # Cure research
+        t = prof.start()
         self._cure_research(dt_days)
-
-        # Tally
-        self.total_infected = sum(s["infected"] for s in self.regions.values())
-        self.total_dead = sum(s["dead"] for s in self.regions.values())
+        prof.stop("cure_research", t)
+
+        if self.total_dead != dead or self.cure_progress != cure:
+            self._emit_milestones(dead, cure)
+
+        if self.history is not None:
+            t = prof.start()
+            self.history.record(self)
+            prof.stop("history", t)
+        prof.stop("tick", t_tick)
+
+    def _emit_milestones(self, dead, cure):
+        """Events for the death and cure milestones passed since (dead, cure)."""
+        day, events = self.age_days, self.events
+        for milestone in DEATH_MILESTONES:
+            if dead <= milestone < self.total_dead:
+                events.append(DeathMilestone(day, milestone, self.total_dead))
+        for k in range(int(cure * CURE_MILESTONES) + 1, int(self.cure_progress * CURE_MILESTONES) + 1):
+            if k < CURE_MILESTONES:
+                events.append(CureMilestone(day, k * 100 // CURE_MILESTONES))
+        if self.cured and cure < 1.0:
+            events.append(Cured(day))
+
+    def _emit_regions(self, event_type, indices):
+        """One region event per region index."""
+        ids, day = self.world.ids, self.age_days
+        self.events.extend(event_type(day, ids[i]) for i in indices)
+
+    def _mutate(self, dt):
+        """Spontaneous mutation of a random gene, at most once per tick."""
+        rng = self.rng
+        if rng.random() < self.genes["mutation"].value * self.balance["mutation"] * dt:
+            self._mutate_once()
+
+    def _mutate_once(self):
+        rng = self.rng
+        key = rng.choice(list(self.genes.keys()))
+        self.genes[key].mutate(self.balance["mutation_step"], rng)
+        self.events.append(Mutation(self.age_days, key, self.genes[key].value))
+        if self.dna_points < 50:
+            self.dna_points += 1
+
+    def advance(self, days, budget_ms=None):
+        """Fast-forward up to `days` using adaptive steps.
+
+        Steps grow to ADVANCE_MAX_STEP days while every region is changing
+        slowly and shrink back towards one day when something moves fast.
+        Stops early once budget_ms of wall time is spent and returns the
+        days actually advanced, so a long catch-up can run in chunks.
+        """
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        start_tick = self.tick_count
+        done = 0
+        while done < days and not self.cured:
+            step = min(self._advance_step(), days - done)
+            self.tick(dt_days=step)
+            done += step
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        if done:
+            # Logged with the days actually covered, which replays to the same steps
+            self.input_log.append((start_tick, "advance", done))
+        return done
+
+    def _advance_step(self):
+        """Largest whole-day step that keeps the tick's Euler update accurate."""
+        rate, max_ratio = self._fastest_rate()
+        g = self.genes
+        cross = self._route_rates()[2]
+        chance = max(g["mutation"].value * self.balance["mutation"],
+                     max_ratio * max(cross, self._coefficients().discover * self.balance["discovery"]))
+
+        step = ADVANCE_MAX_STEP
+        if rate > 0:
+            step = min(step, ADVANCE_TOLERANCE / rate)
+        if chance > 0:
+            step = min(step, ADVANCE_MAX_CHANCE / chance)
+        return max(1, int(step))
+
+    def _fastest_rate(self):
+        """(largest per-day relative change of infected, largest infected ratio)."""
+        c = self._coefficients()
+        trans, base, water = c.trans, c.base, c.water
+        loss = c.death + c.recover * c.recover_stealth
+        climate_mods = c.climate_mods
+        climates = self.world.climate
+        ports = self.world.ports
+
+        rate = 0.0
+        max_ratio = 0.0
+        for i, s in enumerate(self._states):
+            if s["infected"] == 0 or s["population"] == 0:
+                continue
+            max_ratio = max(max_ratio, s["infected"] / s["population"])
+            if s["healthy"] > 0:
+                growth = (trans * climate_mods[climates[i]] + base + water * ports[i]) \
+                    * (s["healthy"] / s["population"])
+                rate = max(rate, growth + loss)
+        return rate, max_ratio
+
+    def _coefficients(self):
+        """Gene-derived factors of the tick formulas, rebuilt only when a gene changes."""
+        if self._coeff_version != self.genes.version:
+            self._coeff = self._build_coefficients()
+            self._coeff_version = self.genes.version
+        return self._coeff
+
+    def _build_coefficients(self):
+        b = self.balance
+        values = dict(zip(self.genes, self.genes.vector))
+        c = gene_coefficients(values, b)
+        return c._replace(spread=self._region_spread(
+            tuple(c.trans * m for m in c.climate_mods), values["air_spread"] * b["air_spread"],
+            values["water_spread"], values["animal_host"] * b["animal_spread"]))
+
+    def _region_spread(self, climate_spread, air, water, animal):
+        """Within-region spread rate of every region (climate, air, ports, animals)."""
+        per_port = self.balance["water_spread"]
+        return [climate_spread[c] + air + water * p * per_port + animal
+                for c, p in zip(self.world.climate, self.world.ports)]
 
     def _spread(self, dt):
-        trans = self.genes["transmission"].value
-        lethal = self.genes["lethality"].value
-        resist = self.genes["resistance"].value
-        stealth = self.genes["stealth"].value
-        air = self.genes["air_spread"].value
-        water = self.genes["water_spread"].value
-        animal = self.genes["animal_host"].value
-
-        region_map = {r["id"]: r for r in REGIONS}
-
-        for region_id, state in self.regions.items():
+        c = self._coefficients()
+        spread = c.spread
+        death_rate = c.death * dt
+        recover_rate = c.recover * dt
+        recover_stealth = c.recover_stealth
+        discover = c.discover
+        discovery = self.balance["discovery"]
+
+        for i, state in enumerate(self._states):
             if state["infected"] == 0:
                 continue
 
-            rdata = region_map[region_id]
             pop = state["population"]
             infected = state["infected"]
             healthy = state["healthy"]
-            dead = state["dead"]
 
             if healthy <= 0:
                 continue
 
-            # Climate modifier
-            climate = rdata.get("climate", "temperate")
-            climate_mod = 1.0
-            if climate == "tropical":
-                climate_mod = 1.0 + self.genes["heat_resist"].value * 0.5
-            elif climate == "cold":
-                climate_mod = 1.0 + self.genes["cold_resist"].value * 0.5
-            elif climate == "arid":
-                climate_mod = 0.7 + self.genes["heat_resist"].value * 0.6
-
-            # Base spread rate
-            spread_rate = trans * 0.08 * climate_mod
-            spread_rate += air * 0.04
-            spread_rate += water * rdata.get("ports", 0) * 0.01
-            spread_rate += animal * 0.02
-
             # New infections
-            new_inf = int(infected * spread_rate * (healthy / pop) * dt)
+            new_inf = int(infected * spread[i] * (healthy / pop) * dt)
             new_inf = min(new_inf, healthy)
             new_inf = max(0, new_inf)
 
             # Deaths
-            death_rate = lethal * 0.005 * dt
             new_dead = int(infected * death_rate)
             new_dead = max(0, new_dead)
 
             # Recoveries (lowered by resistance)
-            recover_rate = max(0.002, 0.01 - resist * 0.009) * dt
-            recovered = int(infected * recover_rate * (1 - stealth * 0.3))
+            recovered = int(infected * recover_rate * recover_stealth)
 
             state["infected"] += new_inf - new_dead - recovered
             state["dead"] += new_dead
@@ -155,65 +507,96 @@ class PathogenSpecies:
             state["healthy"] = max(0, state["healthy"])
             state["infected"] = max(0, state["infected"])
 
+            self.total_infected += state["infected"] - infected
+            self.total_dead += new_dead
+            if state["infected"] == 0:
+                self.regions_hit -= 1
+
             # Discovery
             if not state["discovered"]:
-                discovery_chance = (infected / pop) * (1 - stealth * 0.8) * 0.3 * dt
-                if random.random() < discovery_chance:
+                discovery_chance = (infected / pop) * discover * discovery * dt
+                if self.rng.random() < discovery_chance:
                     state["discovered"] = True
+                    self.regions_discovered += 1
+                    self._emit_regions(RegionDiscovered, (i,))
 
             state["infection_rate"] = infected / pop if pop > 0 else 0
 
         # Cross-region spread
-        self._cross_region_spread(dt, region_map)
-
-    def _cross_region_spread(self, dt, region_map):
-        """Spread between neighboring/connected regions."""
-        air = self.genes["air_spread"].value
-        water = self.genes["water_spread"].value
-        trans = self.genes["transmission"].value
-
-        # List of infected regions
-        infected_regions = [rid for rid, s in self.regions.items() if s["infected"] > 100]
-
-        for src_id in infected_regions:
-            src = self.regions[src_id]
-            src_data = region_map[src_id]
-            src_pop = src["population"]
-            if src_pop == 0:
+        t = self.profiler.start()
+        self._cross_region_spread(dt)
+        self.profiler.stop("cross_spread", t)
+
+    def _route_rates(self):
+        """(per-edge jump rates as array and list, largest inbound total).
+
+        Cached until one of the travel genes or a route closure changes.
+        """
+        g = self.genes
+        key = (g["transmission"].value, g["air_spread"].value, g["water_spread"].value,
+               self._routes_version)
+        if key != self._route_key:
+            b = self.balance
+            rates = self.travel.rates(key[0] * b["jump_generic"], key[1] * b["jump_air"],
+                                      key[2] * b["jump_sea"])
+            rates[self.closed_routes] = 0.0
+            self._route_cache = (rates, rates.tolist(), self.travel.max_inbound(rates))
+            self._route_key = key
+        return self._route_cache
+
+    def close_routes(self, mode=None, region_id=None, closed=True):
+        """Close (or reopen) travel routes of a mode and/or touching a region."""
+        region = None if region_id is None else self.world.index[region_id]
+        self.input_log.append((self.tick_count, "close_routes", mode, region_id, closed))
+        self.closed_routes[self.travel.edge_mask(mode, region)] = closed
+        self._routes_version += 1
+        self._changed()
+
+    def _cross_region_spread(self, dt):
+        """Seed other regions along the travel network."""
+        states = self._states
+        rng = self.rng
+        travel = self.travel
+        indptr, targets = travel.indptr_list, travel.indices_list
+        rates = self._route_rates()[1]
+
+        # Jump pressure per target: sum of route rate x source infected ratio
+        pressure = {}
+        for src_i, src in enumerate(states):
+            if src["infected"] <= 100 or src["population"] == 0:
                 continue
-
-            inf_ratio = src["infected"] / src_pop
-
-            # Spread chance based on genes
-            spread_chance = (trans * 0.03 + air * 0.06 + water * src_data.get("ports", 0) * 0.02) * inf_ratio * dt
-
-            if random.random() < spread_chance:
-                # Pick random target region
-                target_id = random.choice([r["id"] for r in REGIONS if r["id"] != src_id])
-                target = self.regions[target_id]
-
-                if target["healthy"] > 0 and target["infected"] == 0:
-                    # Seed infection
-                    seed = random.randint(1, max(1, int(target["population"] * 0.00005)))
-                    target["infected"] = seed
-                    target["healthy"] -= seed
-                elif target["infected"] > 0:
-                    extra = random.randint(1, max(1, int(target["healthy"] * 0.001)))
-                    target["infected"] += extra
-                    target["healthy"] -= extra
-                    target["healthy"] = max(0, target["healthy"])
+            weight = src["infected"] / src["population"] * dt
+            for e in range(indptr[src_i], indptr[src_i + 1]):
+                if rates[e]:
+                    t = targets[e]
+                    pressure[t] = pressure.get(t, 0.0) + rates[e] * weight
+
+        for target_i, p in pressure.items():
+            if rng.random() >= -math.expm1(-p):
+                continue
+            target = states[target_i]
+            if target["healthy"] > 0 and target["infected"] == 0:
+                # Seed infection
+                seed = min(target["healthy"], rng.randint(1, self.world.jump_seed[target_i]))
+                target["infected"] = seed
+                target["healthy"] -= seed
+                self.total_infected += seed
+                self.regions_hit += 1
+                self._emit_regions(RegionInfected, (target_i,))
+            elif target["infected"] > 0:
+                extra = min(target["healthy"], rng.randint(1, max(1, int(target["healthy"] * 0.001))))
+                target["infected"] += extra
+                target["healthy"] -= extra
+                self.total_infected += extra
 
     def _cure_research(self, dt):
         """World cure research speeds up when regions discover pathogen."""
-        discovered = sum(1 for s in self.regions.values() if s["discovered"])
+        discovered = self.regions_discovered
         if discovered == 0:
             return
 
-        stealth = self.genes["stealth"].value
-        resist = self.genes["resistance"].value
-
-        research_speed = (discovered / len(self.regions)) * 0.002 * dt
-        research_speed *= (1 - stealth * 0.4) * (1 - resist * 0.5)
+        research_speed = (discovered / len(self.world)) * self.balance["cure_research"] * dt
+        research_speed *= self._coefficients().cure
 
         self.cure_progress = min(1.0, self.cure_progress + research_speed)
 
@@ -221,29 +604,48 @@ class PathogenSpecies:
             self.cured = True
 
     def evolve_gene(self, gene_key, amount=0.1):
-        cost = 2
-        if self.dna_points >= cost:
+        self.input_log.append((self.tick_count, "evolve", gene_key, amount))
+        if self.dna_points >= EVOLVE_COST:
             self.genes[gene_key].evolve(amount)
-            self.dna_points -= cost
+            self.dna_points -= EVOLVE_COST
+            self._changed()
             return True
         return False
 
+    def reseed(self, seed):
+        """Restart the random streams from `seed`, e.g. when branching a timeline."""
+        self.input_log.append((self.tick_count, "reseed", seed))
+        self.rng.seed(seed)
+        self._changed()
+
+    def record_speed(self, speed):
+        """Log a UI speed change; it doesn't affect the trajectory, only the replay timeline."""
+        self.input_log.append((self.tick_count, "speed", speed))
+
+    def region_snapshot(self):
+        """Read-only copy of per-region state, safe to hand to another thread."""
+        return MappingProxyType({rid: MappingProxyType(dict(s)) for rid, s in self.regions.items()})
+
     def get_stats(self):
-        world_pop = WORLD_TOTAL_POP * 1_000_000
+        """Current totals. Cached until the next tick or gene purchase; don't mutate."""
+        if self._stats is not None:
+            return self._stats
+
+        world_pop = self.world.total_population
         infected_pct = (self.total_infected / world_pop * 100) if world_pop > 0 else 0
         dead_pct = (self.total_dead / world_pop * 100) if world_pop > 0 else 0
-        regions_hit = sum(1 for s in self.regions.values() if s["infected"] > 0)
 
-        return {
+        self._stats = {
             "infected": self.total_infected,
             "dead": self.total_dead,
             "infected_pct": infected_pct,
             "dead_pct": dead_pct,
-            "regions_hit": regions_hit,
+            "regions_hit": self.regions_hit,
             "cure_pct": self.cure_progress * 100,
             "dna_points": self.dna_points,
             "age_days": self.age_days,
         }
+        return self._stats
 
 
 def format_number(n):
@@ -0,0 +1,203 @@
+"""
+Ensemble forecasts: many seeded futures of the current game.
+
+A single run is one noisy sample (discovery, mutation and route jumps are
+random). A Forecaster captures the species once, ships that compact
+SaveState to a pool of worker processes and runs `members` futures, each
+on its own random stream, then reduces them to percentile bands of world
+infected/dead and cure progress plus outcome probabilities.
+
+The pool is created on first use and kept: workers load the world and
+build its travel network once, so later forecasts only pay for the
+simulation itself.
+
+    python -m game.forecast br --warmup 60 --days 365 --members 64
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from game.savegame import SaveState, capture, restore
+
+PERCENTILES = (5, 25, 50, 75, 95)
+SERIES = ("infected", "dead", "cure_progress")
+
+_WORLD = None   # per worker process, set by _init_worker
+
+Outcome = namedtuple("Outcome", "series cured_day extinct_day")
+
+
+class Forecast:
+    """Percentile bands over the members of one ensemble."""
+
+    def __init__(self, start_day, days, every, outcomes):
+        self.members = len(outcomes)
+        self.days = start_day + np.arange(0, days + 1, every)
+        self.series = {name: np.array([o.series[name] for o in outcomes]) for name in SERIES}
+        self.bands = {name: dict(zip(PERCENTILES, np.percentile(values, PERCENTILES, axis=0)))
+                      for name, values in self.series.items()}
+        cured = np.array([o.cured_day is not None for o in outcomes])
+        extinct = np.array([o.extinct_day is not None for o in outcomes])
+        # Probability the cure is found before the pathogen dies out on its own
+        self.p_cure = float(cured.mean())
+        self.p_extinct = float(extinct.mean())
+        self.p_spreading = float((~cured & ~extinct).mean())
+        cure_days = [o.cured_day for o in outcomes if o.cured_day is not None]
+        self.cure_day = dict(zip(PERCENTILES, np.percentile(cure_days, PERCENTILES))) if cure_days else None
+
+    def band(self, name, low=5, high=95):
+        """(low, median, high) arrays of one series."""
+        b = self.bands[name]
+        return b[low], b[50], b[high]
+
+    def summary(self):
+        """JSON-ready final-day bands and outcome probabilities."""
+        return {
+            "members": self.members,
+            "day": float(self.days[-1]),
+            "p_cure": self.p_cure,
+            "p_extinct": self.p_extinct,
+            "p_spreading": self.p_spreading,
+            "cure_day": None if self.cure_day is None else {q: float(v) for q, v in self.cure_day.items()},
+            **{name: {q: float(v[-1]) for q, v in self.bands[name].items()} for name in SERIES},
+        }
+
+
+# ── Worker side ──────────────────────────────────────────────
+
+def _init_worker(world):
+    global _WORLD
+    from game.travel import travel_network
+    from game.world_data import WORLD
+    _WORLD = WORLD if world is None else world
+    travel_network(_WORLD)
+
+
+def _run_members(state, seeds, days, every):
+    """Run one future per seed from `state`; list of Outcomes."""
+    outcomes = []
+    for seed in seeds:
+        species = restore(state, world=_WORLD)
+        species.reseed(int(seed))
+        series = {name: [] for name in SERIES}
+        cured_day = extinct_day = None
+        for day in range(days + 1):
+            if day % every == 0:
+                series["infected"].append(species.total_infected)
+                series["dead"].append(species.total_dead)
+                series["cure_progress"].append(species.cure_progress)
+            if day == days or cured_day is not None or extinct_day is not None:
+                continue
+            species.tick(dt_days=1.0)
+            if species.cured:
+                cured_day = species.age_days
+            elif species.total_infected == 0:
+                extinct_day = species.age_days
+        outcomes.append(Outcome(series, cured_day, extinct_day))
+    return outcomes
+
+
+# ── Pool ─────────────────────────────────────────────────────
+
+class Forecaster:
+    """Reusable process pool that runs ensemble forecasts."""
+
+    def __init__(self, world=None, max_workers=None):
+        self.world = world
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            # spawn, not fork: the game forks from a process with a simulation
+            # thread running, which could leave a lock held in the child
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker, initargs=(self.world,))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, source, days=180, members=32, every=1, seed=None):
+        """Start a forecast of `days` from a species (captured now, so call it
+        between ticks) or a SaveState; returns a Future of a Forecast."""
+        state = capture(source) if not isinstance(source, SaveState) else source
+        # The futures don't need the log or RNG state of the past
+        state = SaveState(dict(state.header, input_log=[]), state.arrays)
+        seeds = np.random.SeedSequence(seed).generate_state(members, dtype=np.uint64)
+
+        pool = self._executor()
+        chunks = np.array_split(seeds, min(members, self.max_workers * 2))
+        parts = [pool.submit(_run_members, state, chunk.tolist(), days, every)
+                 for chunk in chunks if len(chunk)]
+
+        result = concurrent.futures.Future()
+        start_day = state.header["age_days"]
+
+        def gather(_):
+            if result.done() or not all(p.done() for p in parts):
+                return
+            try:
+                outcomes = [o for p in parts for o in p.result()]
+                result.set_result(Forecast(start_day, days, every, outcomes))
+            except Exception as e:   # a failed or cancelled member fails the forecast
+                if not result.done():
+                    result.set_exception(e)
+
+        for p in parts:
+            p.add_done_callback(gather)
+        return result
+
+    def forecast(self, source, days=180, members=32, every=1, seed=None):
+        """Blocking submit()."""
+        return self.submit(source, days, members, every, seed).result()
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+def main(argv=None):
+    from game.replay import engine_class
+    from game.sim import ENGINE_NAMES
+    from game.world_data import WORLD
+
+    parser = argparse.ArgumentParser(prog="python -m game.forecast",
+                                     description="Ensemble forecast of a fresh game.")
+    parser.add_argument("origin")
+    parser.add_argument("--engine", choices=sorted(ENGINE_NAMES), default="array")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--warmup", type=int, default=0, help="days to play before forecasting")
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--members", type=int, default=32)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+    if args.origin not in WORLD.index:
+        parser.error(f"unknown origin region: {args.origin}")
+
+    species = engine_class(ENGINE_NAMES[args.engine])("Patógeno X", args.origin, seed=args.seed)
+    for _ in range(args.warmup):
+        species.tick(dt_days=1.0)
+    with Forecaster(max_workers=args.workers) as forecaster:
+        result = forecaster.forecast(species, args.days, args.members, seed=args.seed)
+    json.dump(result.summary(), sys.stdout, indent=1)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
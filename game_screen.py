@@ -0,0 +1,655 @@
+"""
+Game screen: map, stats, gene panel and the dialogs of a running game.
+
+Imported on demand when a game starts (see main.py), so the simulation,
+NumPy and the widgets only this screen uses stay off the launch path.
+"""
+
+import os
+from collections import deque
+
+from kivy.app import App
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.progressbar import ProgressBar
+from kivy.uix.slider import Slider
+from kivy.clock import Clock
+from kivy.metrics import dp, sp
+from kivy.core.window import Window
+
+from game.evolution import GENE_DEFINITIONS, format_number
+from game.events import (WIN_DEAD, Cured, CureMilestone, DeathMilestone, EventBus, Mutation,
+                         RegionDiscovered, RegionInfected)
+from game.theme import (C_BG, C_PANEL, C_ACCENT, C_GREEN, C_RED, C_YELLOW, C_TEXT,
+                        C_SUBTEXT, make_bg)
+from game.world_data import WORLD
+from game.world_map import WorldMapWidget
+from game.runner import SimulationRunner
+from game.profiling import NULL_PROFILER, PhaseProfiler
+from game.history import HistoryRecorder
+from game.timeline import Timeline
+AUTOSAVE_INTERVAL = 60  # seconds
+GENE_ROWS_FIRST = 4     # gene rows built with the panel; the rest follow one per frame
+NEWS_SECONDS = 2.5      # per headline
+NEWS_BACKLOG = 8        # older headlines are dropped
+GENE_NAMES = {gkey: name for name, gkey, _, _ in GENE_DEFINITIONS}
+
+
+class StatBox(BoxLayout):
+    def __init__(self, label, value, color=C_TEXT, **kwargs):
+        super().__init__(orientation='vertical', **kwargs)
+        self.size_hint_y = None
+        self.height = dp(52)
+        make_bg(self, (0.05, 0.09, 0.18, 1))
+
+        self.lbl_title = Label(text=label, font_size=sp(9),
+                               color=C_SUBTEXT, size_hint_y=0.4)
+        self.lbl_val = Label(text=value, font_size=sp(15),
+                             bold=True, color=color, size_hint_y=0.6)
+        self.add_widget(self.lbl_title)
+        self.add_widget(self.lbl_val)
+
+    def update(self, value, color=None):
+        self.lbl_val.text = value
+        if color:
+            self.lbl_val.color = color
+
+
+class GeneButton(BoxLayout):
+    def __init__(self, gene_key, gene_obj, on_evolve, **kwargs):
+        super().__init__(orientation='horizontal', spacing=dp(4), **kwargs)
+        self.size_hint_y = None
+        self.height = dp(46)
+        self.gene_key = gene_key
+        self.gene_obj = gene_obj
+        self.on_evolve = on_evolve
+        self._version = gene_obj.version
+
+        # Left: icon + name
+        left = BoxLayout(orientation='vertical', size_hint_x=0.4)
+        self.lbl_name = Label(text=f"{gene_obj.icon} {gene_obj.name}",
+                              font_size=sp(10), color=C_TEXT,
+                              halign='left', valign='middle')
+        self.lbl_name.bind(size=self.lbl_name.setter('text_size'))
+        left.add_widget(self.lbl_name)
+
+        # Middle: progress bar
+        mid = BoxLayout(orientation='vertical', size_hint_x=0.35,
+                        padding=[0, dp(12)])
+        self.bar = ProgressBar(max=1.0, value=gene_obj.value)
+        mid.add_widget(self.bar)
+
+        # Right: evolve button
+        btn = Button(text=f"+2🧬", size_hint_x=0.25,
+                     background_color=(0.1, 0.2, 0.4, 1),
+                     color=(1, 0.85, 0.1, 1),
+                     font_size=sp(10))
+        btn.bind(on_press=lambda b: self.on_evolve(gene_key))
+
+        self.add_widget(left)
+        self.add_widget(mid)
+        self.add_widget(btn)
+
+    def refresh(self, value, version):
+        if version != self._version:
+            self._version = version
+            self.bar.value = value
+
+
+class TopBar(BoxLayout):
+    def __init__(self, **kwargs):
+        super().__init__(orientation='horizontal', size_hint_y=None,
+                         height=dp(48), padding=[dp(8), dp(4)],
+                         spacing=dp(8), **kwargs)
+        make_bg(self, (0.02, 0.04, 0.10, 1))
+
+        self.lbl_title = Label(
+            text="🧬 EVOLUÇÃO REAL",
+            font_size=sp(14), bold=True, color=C_ACCENT,
+            size_hint_x=0.35
+        )
+        self.lbl_day = Label(text="Dia 0", font_size=sp(11), color=C_SUBTEXT, size_hint_x=0.15)
+        self.lbl_infected = Label(text="🦠 0", font_size=sp(12), color=C_YELLOW, size_hint_x=0.2)
+        self.lbl_dead = Label(text="💀 0", font_size=sp(12), color=C_RED, size_hint_x=0.2)
+        self.lbl_dna = Label(text="🧬 10", font_size=sp(12), color=C_GREEN, size_hint_x=0.1)
+
+        for w in [self.lbl_title, self.lbl_day, self.lbl_infected, self.lbl_dead, self.lbl_dna]:
+            self.add_widget(w)
+
+        # Last rendered raw values; labels are only touched when these change
+        self._shown = {}
+
+    def _changed(self, key, value):
+        if self._shown.get(key) == value:
+            return False
+        self._shown[key] = value
+        return True
+
+    def update(self, stats, day, dna):
+        if self._changed("day", int(day)):
+            self.lbl_day.text = f"Dia {int(day)}"
+        if self._changed("infected", stats["infected"]):
+            self.lbl_infected.text = f"🦠 {format_number(stats['infected'])}"
+        if self._changed("dead", stats["dead"]):
+            self.lbl_dead.text = f"💀 {format_number(stats['dead'])}"
+        if self._changed("dna", dna):
+            self.lbl_dna.text = f"🧬 {dna}"
+
+
+class CureBar(BoxLayout):
+    def __init__(self, **kwargs):
+        super().__init__(orientation='horizontal', size_hint_y=None,
+                         height=dp(22), padding=[dp(8), 0], **kwargs)
+        make_bg(self, (0.04, 0.02, 0.06, 1))
+
+        lbl = Label(text="💊 Cura:", font_size=sp(9), color=(0.7, 0.4, 0.9), size_hint_x=0.2)
+        self.add_widget(lbl)
+
+        self.bar = ProgressBar(max=100, value=0, size_hint_x=0.8)
+        self.add_widget(self.bar)
+
+    def update(self, pct):
+        if pct != self.bar.value:
+            self.bar.value = pct
+
+
+class RegionPanel(BoxLayout):
+    """Bottom panel showing selected region info."""
+    def __init__(self, **kwargs):
+        super().__init__(orientation='vertical', size_hint_y=None,
+                         height=dp(90), padding=dp(8), spacing=dp(4), **kwargs)
+        make_bg(self, (0.05, 0.08, 0.18, 1))
+
+        self.lbl_name = Label(text="Toque em um país para ver detalhes",
+                              font_size=sp(11), bold=True, color=C_ACCENT)
+        self.lbl_stats = Label(text="", font_size=sp(10), color=C_TEXT)
+        self.lbl_bar_label = Label(text="", font_size=sp(9), color=C_SUBTEXT)
+        self.inf_bar = ProgressBar(max=100, value=0)
+
+        self.add_widget(self.lbl_name)
+        self.add_widget(self.lbl_stats)
+        self.add_widget(self.lbl_bar_label)
+        self.add_widget(self.inf_bar)
+
+    def show_region(self, region_data, state):
+        name = region_data["name"]
+        pop = state["population"]
+        inf = state["infected"]
+        dead = state["dead"]
+        disc = "✓ Detectada" if state["discovered"] else "⚠ Não detectada"
+
+        self.lbl_name.text = f"📍 {name}  [{disc}]"
+        inf_pct = inf / pop * 100 if pop > 0 else 0
+        dead_pct = dead / pop * 100 if pop > 0 else 0
+        self.lbl_stats.text = (
+            f"🦠 {format_number(inf)} infectados ({inf_pct:.1f}%) | "
+            f"💀 {format_number(dead)} mortos ({dead_pct:.2f}%)"
+        )
+        self.lbl_bar_label.text = f"Taxa de infecção: {inf_pct:.1f}%"
+        self.inf_bar.value = min(100, inf_pct)
+
+
+class GenePanel(ScrollView):
+    TITLE = "⚡ EVOLUÇÃO DO PATÓGENO"
+
+    def __init__(self, pathogen, runner, **kwargs):
+        super().__init__(**kwargs)
+        self.pathogen = pathogen
+        self.runner = runner
+        self.autoplayer = None   # created with the first hint
+        self._hint = None
+        self.do_scroll_x = False
+
+        self.container = GridLayout(cols=1, spacing=dp(3), padding=dp(4),
+                                    size_hint_y=None)
+        self.container.bind(minimum_height=self.container.setter('height'))
+
+        # Header, with the hint button
+        hdr = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(28))
+        self.lbl_header = Label(text=self.TITLE, font_size=sp(11),
+                                bold=True, color=C_ACCENT, size_hint_x=0.75)
+        hint_btn = Button(text="💡 Dica", font_size=sp(10), size_hint_x=0.25,
+                          background_color=(0.1, 0.2, 0.4, 1))
+        hint_btn.bind(on_press=self._on_hint)
+        hdr.add_widget(self.lbl_header)
+        hdr.add_widget(hint_btn)
+        self.container.add_widget(hdr)
+
+        self.gene_buttons = {}
+        self._pending_rows = [gkey for _, gkey, _, _ in GENE_DEFINITIONS]
+        self._add_rows(GENE_ROWS_FIRST)
+        if self._pending_rows:
+            Clock.schedule_interval(self._add_next_row, 0)
+
+        self.add_widget(self.container)
+
+    def _add_rows(self, count):
+        for gkey in self._pending_rows[:count]:
+            gb = GeneButton(gkey, self.pathogen.genes[gkey], self._on_evolve)
+            self.container.add_widget(gb)
+            self.gene_buttons[gkey] = gb
+        del self._pending_rows[:count]
+
+    def _add_next_row(self, dt):
+        self._add_rows(1)
+        if not self._pending_rows:
+            return False
+
+    def stop(self):
+        Clock.unschedule(self._add_next_row)
+        Clock.unschedule(self._poll_hint)
+
+    def _on_evolve(self, gene_key):
+        # Applied by the runner between ticks; the bar updates from the next snapshot
+        self.runner.evolve_gene(gene_key)
+        self._show_hint(None, self.TITLE)
+
+    def _on_hint(self, btn):
+        if self._hint is not None:
+            return
+        if self.autoplayer is None:
+            from game.autoplay import Autoplayer
+            self.autoplayer = Autoplayer()
+        self._hint = self.runner.hint(self.autoplayer)
+        self.lbl_header.text = "💡 Simulando..."
+        Clock.schedule_interval(self._poll_hint, 0.1)
+
+    def _poll_hint(self, dt):
+        if self._hint is None:
+            return False
+        if not self._hint.done():
+            return
+        future, self._hint = self._hint, None
+        if future.exception() is not None:
+            self._show_hint(None, self.TITLE)
+        elif future.result() is None:
+            self._show_hint(None, "💡 Dica: guarde o DNA")
+        else:
+            gene = self.pathogen.genes[future.result()]
+            self._show_hint(future.result(), f"💡 Dica: {gene.icon} {gene.name}")
+        return False
+
+    def _show_hint(self, gene_key, text):
+        self.lbl_header.text = text
+        for gkey, gb in self.gene_buttons.items():
+            gb.lbl_name.color = C_YELLOW if gkey == gene_key else C_TEXT
+
+    def refresh(self, genes, versions):
+        for gkey, gb in self.gene_buttons.items():
+            gb.refresh(genes[gkey], versions[gkey])
+
+
+class PerfOverlay(Button):
+    """Frame time, tick rate and slowest phases; tap to export a Chrome trace."""
+    def __init__(self, profiler, **kwargs):
+        super().__init__(font_size=sp(9), color=C_YELLOW, halign='left', valign='top',
+                         background_normal='', background_color=(0, 0, 0, 0.65),
+                         size_hint=(0.6, None), height=dp(64), **kwargs)
+        self.profiler = profiler
+        self.bind(size=self.setter('text_size'))
+        self.bind(on_press=self._export)
+        Clock.schedule_interval(self.update, 0.25)
+
+    def update(self, dt):
+        prof = self.profiler
+        top = prof.top(3, exclude=("frame", "tick"))
+        self.text = (
+            f"⏱ frame p50 {prof.percentile('frame', 50):.2f} ms | p95 {prof.percentile('frame', 95):.2f} ms\n"
+            f"🦠 {prof.rate('tick'):.1f} ticks/s | tick p95 {prof.percentile('tick', 95):.2f} ms\n"
+            + " | ".join(f"{name} {ms:.2f}" for name, ms in top)
+        )
+
+    def _export(self, *args):
+        path = os.path.join(App.get_running_app().user_data_dir, "trace.json")
+        self.profiler.export_chrome_trace(path)
+        self.text = f"💾 Trace salvo em {path}"
+
+    def close(self):
+        Clock.unschedule(self.update)
+        if self.parent:
+            self.parent.remove_widget(self)
+
+
+class NewsTicker(Label):
+    """One-line headlines of the game's events, each shown for NEWS_SECONDS."""
+    def __init__(self, **kwargs):
+        super().__init__(text="", font_size=sp(10), color=C_YELLOW, halign='left',
+                         valign='middle', shorten=True, padding=[dp(6), 0], **kwargs)
+        make_bg(self, (0.04, 0.06, 0.15, 0.85))
+        self.bind(size=lambda *a: setattr(self, 'text_size', self.size))
+        self._backlog = deque(maxlen=NEWS_BACKLOG)
+        Clock.schedule_interval(self._next, NEWS_SECONDS)
+
+    def post(self, text):
+        self._backlog.append(text)
+        if not self.text:
+            self._next()
+
+    def _next(self, dt=None):
+        self.text = self._backlog.popleft() if self._backlog else ""
+
+    def stop(self):
+        Clock.unschedule(self._next)
+
+
+class GameScreen(FloatLayout):
+    def __init__(self, pathogen, saver=None, **kwargs):
+        super().__init__(**kwargs)
+        self.pathogen = pathogen
+        self.saver = saver
+        self.game_speed = 1.0
+        self.paused = False
+        self.game_over = False
+        self._tick_acc = 0.0
+        self.timeline = Timeline(pathogen.world)
+        self.history = HistoryRecorder(pathogen.world)
+        self.history.record(pathogen)
+        pathogen.history = self.history
+        self.runner = SimulationRunner(pathogen, timeline=self.timeline)
+        self.profiler = NULL_PROFILER
+        self.perf_overlay = None
+        self._rendered_version = None
+        self.events = pathogen.events
+
+        make_bg(self, C_BG)
+        self._build_ui()
+        self._subscribe()
+        self._check_end()
+
+        Clock.schedule_interval(self._tick, 1 / 30)
+        if saver:
+            Clock.schedule_interval(self._autosave, AUTOSAVE_INTERVAL)
+
+    def stop(self):
+        Clock.unschedule(self._tick)
+        Clock.unschedule(self._autosave)
+        self.gene_panel.stop()
+        self.news.stop()
+        if self.perf_overlay:
+            self.perf_overlay.close()
+        self.world_map.stop()
+        # Joined so a save queued just before stopping is still captured
+        self.runner.stop(timeout=1.0)
+
+    def save(self):
+        """Capture the game between ticks; the saver writes it in the background."""
+        if self.saver and not self.game_over:
+            self.runner.save(self.saver)
+
+    def _autosave(self, dt):
+        self.save()
+
+    def _build_ui(self):
+        # ── Top Bar ──────────────────────────────────────────
+        self.top_bar = TopBar(
+            pos_hint={"top": 1}, size_hint=(1, None)
+        )
+        self.add_widget(self.top_bar)
+
+        # ── Cure Bar ─────────────────────────────────────────
+        self.cure_bar = CureBar(
+            pos_hint={"top": 0.93}, size_hint=(1, None)
+        )
+        self.add_widget(self.cure_bar)
+
+        # ── Speed Buttons ────────────────────────────────────
+        speed_row = BoxLayout(
+            orientation='horizontal', size_hint=(0.5, None),
+            height=dp(28), pos_hint={"top": 0.905, "right": 1},
+            spacing=dp(2), padding=[dp(4), 0]
+        )
+        make_bg(speed_row, (0.04, 0.06, 0.15, 1))
+        for label, speed in [("⏸", 0), ("▶", 1), ("⏩", 3), ("⏭", 8)]:
+            b = Button(text=label, font_size=sp(11),
+                       background_color=(0.08, 0.14, 0.28, 1))
+            b.speed = speed
+            b.bind(on_press=self._set_speed)
+            speed_row.add_widget(b)
+        perf_btn = Button(text="⏱", font_size=sp(11),
+                          background_color=(0.08, 0.14, 0.28, 1))
+        perf_btn.bind(on_press=self._toggle_perf)
+        speed_row.add_widget(perf_btn)
+        rewind_btn = Button(text="⏪", font_size=sp(11),
+                            background_color=(0.08, 0.14, 0.28, 1))
+        rewind_btn.bind(on_press=self._open_rewind)
+        speed_row.add_widget(rewind_btn)
+        self.add_widget(speed_row)
+
+        # ── World Map (center) ───────────────────────────────
+        self.world_map = WorldMapWidget(
+            runner=self.runner,
+            on_region_click=self._on_region_click,
+            pos_hint={"x": 0, "top": 0.905},
+            size_hint=(1, None),
+            height=Window.height * 0.42
+        )
+        self.add_widget(self.world_map)
+
+        # ── News Ticker (over the map, left of the speed buttons) ──
+        self.news = NewsTicker(pos_hint={"x": 0, "top": 0.905}, size_hint=(0.5, None), height=dp(28))
+        self.add_widget(self.news)
+
+        # ── Region Info Panel ────────────────────────────────
+        map_bottom = 1 - 0.905 + Window.height * 0.42 / Window.height
+        self.region_panel = RegionPanel(
+            pos_hint={"x": 0, "top": 1 - 0.905 + 0.42 + 0.12},
+            size_hint=(1, None)
+        )
+        self.add_widget(self.region_panel)
+
+        # ── Gene Evolution Panel (bottom) ────────────────────
+        self.gene_panel = GenePanel(
+            pathogen=self.pathogen,
+            runner=self.runner,
+            pos_hint={"x": 0, "y": 0},
+            size_hint=(1, 0.30)
+        )
+        self.add_widget(self.gene_panel)
+
+        # Update map height dynamically
+        self.bind(size=self._on_resize)
+
+    # ── Events ───────────────────────────────────────────────
+    def _subscribe(self):
+        bus = self.bus = EventBus()
+        bus.subscribe(Cured, self._on_cured)
+        bus.subscribe(DeathMilestone, self._on_deaths)
+        bus.subscribe(CureMilestone, self._on_cure_milestone)
+        bus.subscribe(RegionInfected, self._on_region_infected)
+        bus.subscribe(RegionDiscovered, self._on_region_discovered)
+        bus.subscribe(Mutation, self._on_mutation)
+
+    def _check_end(self):
+        """End the game from the snapshot's state, for when no terminal event
+        will arrive: a restored save that had already ended, or events dropped
+        from the full queue during a long catch-up."""
+        snap = self.runner.snapshot
+        if snap.cured:
+            self._on_cured(None)
+        elif snap.stats["dead"] > WIN_DEAD:
+            self._on_deaths(DeathMilestone(snap.age_days, WIN_DEAD, snap.stats["dead"]))
+
+    def _on_cured(self, event):
+        self._show_result(won=False, reason="💊 A humanidade desenvolveu a cura!")
+
+    def _on_deaths(self, event):
+        if event.milestone >= WIN_DEAD:
+            self._show_result(won=True, reason="☠️ Toda a humanidade foi exterminada!")
+        else:
+            self.news.post(f"☠️ {format_number(event.milestone)} mortos no mundo")
+
+    def _on_cure_milestone(self, event):
+        self.news.post(f"💊 Pesquisa da cura em {event.percent}%")
+
+    def _on_region_infected(self, event):
+        self.world_map.flash(event.region)
+        self.news.post(f"🦠 Primeiros casos em {WORLD.record(event.region)['name']}")
+
+    def _on_region_discovered(self, event):
+        self.world_map.flash(event.region, C_ACCENT)
+        self.news.post(f"🔬 {WORLD.record(event.region)['name']} detecta o patógeno")
+
+    def _on_mutation(self, event):
+        self.news.post(f"🧬 Mutação espontânea: {GENE_NAMES[event.gene]}")
+
+    def _on_resize(self, *args):
+        self.world_map.height = self.height * 0.40
+        self.world_map.pos_hint = {"x": 0, "top": 0.905}
+
+    def _set_speed(self, btn):
+        speed = btn.speed
+        self.runner.set_speed(speed)
+        if speed == 0:
+            self.paused = True
+        else:
+            self.paused = False
+            self.game_speed = speed
+
+    def _toggle_perf(self, btn):
+        if self.perf_overlay:
+            self.perf_overlay.close()
+            self.perf_overlay = None
+            prof = NULL_PROFILER
+        else:
+            prof = PhaseProfiler()
+            self.perf_overlay = PerfOverlay(prof, pos_hint={"x": 0, "top": 0.875})
+            self.add_widget(self.perf_overlay)
+        self.profiler = self.runner.profiler = self.pathogen.profiler = prof
+
+    def _on_region_click(self, region_id):
+        region_data = WORLD.record(region_id)
+        if region_data and self.pathogen:
+            state = self.runner.snapshot.regions.get(region_id, {})
+            if state:
+                self.region_panel.show_region(region_data, state)
+
+    def _tick(self, dt):
+        if self.game_over or not self.pathogen:
+            return
+        prof = self.profiler
+        t_frame = prof.start()
+
+        if self.runner.species is not self.pathogen:
+            self._adopt(self.runner.species)
+
+        # Paused games request no days, but purchases and rewinds still show
+        if self.paused or self.runner.catchup_progress is not None:
+            self._tick_acc = 0.0
+        else:
+            self._tick_acc += dt * self.game_speed * 0.5  # 0.5 = days per real second at speed 1
+
+        if self._tick_acc >= 1.0:
+            days = int(self._tick_acc)
+            self._tick_acc -= days
+            self.runner.request_days(days)
+
+        snap = self.runner.snapshot
+        stats = snap.stats
+        if snap.version != self._rendered_version:
+            # Only redraw when a tick or gene purchase produced a new version
+            self._rendered_version = snap.version
+            t = prof.start()
+            self.top_bar.update(stats, snap.age_days, snap.dna_points)
+            prof.stop("ui.top_bar", t)
+            t = prof.start()
+            self.cure_bar.update(stats["cure_pct"])
+            prof.stop("ui.cure_bar", t)
+            t = prof.start()
+            self.gene_panel.refresh(snap.genes, snap.gene_versions)
+            prof.stop("ui.gene_panel", t)
+
+        # Only events up to the shown day, so news and the end screen match the stats
+        t = prof.start()
+        self.bus.dispatch(self.events, snap.age_days)
+        prof.stop("ui.events", t)
+        prof.stop("frame", t_frame)
+
+    def _adopt(self, pathogen):
+        """Switch the widgets over to a species branched from the timeline."""
+        self.pathogen = pathogen
+        self.world_map._colored_version = None
+        self.gene_panel.pathogen = pathogen
+        self.events = pathogen.events
+        self._rendered_version = None
+        self._check_end()
+
+    def _open_rewind(self, btn):
+        days = self.timeline.days()
+        if len(days) < 2:
+            return
+
+        content = BoxLayout(orientation='vertical', padding=dp(16), spacing=dp(12))
+        lbl = Label(text="", font_size=sp(13), color=C_TEXT)
+        slider = Slider(min=0, max=len(days) - 1, step=1, value=len(days) - 1)
+        go = Button(text="⏪ Voltar para este dia", size_hint_y=None, height=dp(44),
+                    background_color=(0.1, 0.3, 0.6, 1))
+        content.add_widget(lbl)
+        content.add_widget(slider)
+        content.add_widget(go)
+        popup = Popup(title="Linha do tempo", content=content, size_hint=(0.85, 0.4),
+                      background_color=C_PANEL)
+
+        def show(*args):
+            lbl.text = f"Dia {int(days[int(slider.value)])}"
+
+        def rewind(*args):
+            # The runner swaps species between ticks; _tick adopts it
+            self.runner.branch(days[int(slider.value)])
+            popup.dismiss()
+
+        slider.bind(value=show)
+        go.bind(on_press=rewind)
+        show()
+        popup.open()
+
+    def catch_up(self, days):
+        """Fast-forward days spent offline on the worker, showing progress."""
+        if days < 1:
+            return
+        self.runner.fast_forward(days)
+
+        content = BoxLayout(orientation='vertical', padding=dp(16), spacing=dp(12))
+        content.add_widget(Label(text="⏰ O mundo evoluiu enquanto você estava fora...",
+                                 font_size=sp(12), color=C_TEXT))
+        bar = ProgressBar(max=days, value=0)
+        content.add_widget(bar)
+        popup = Popup(title="Simulação offline", content=content, size_hint=(0.85, 0.3),
+                      auto_dismiss=False, background_color=C_PANEL)
+        popup.open()
+
+        def poll(dt):
+            progress = self.runner.catchup_progress
+            if progress is None:
+                popup.dismiss()
+                self._check_end()
+                return False
+            bar.value = progress[0]
+
+        Clock.schedule_interval(poll, 1 / 30)
+
+    def _show_result(self, won, reason):
+        if not self.game_over:
+            self.game_over = self.paused = True
+            if self.saver:
+                self.saver.discard()
+            color = C_GREEN if won else C_RED
+            title = "🏆 VITÓRIA!" if won else "❌ DERROTA"
+            content = BoxLayout(orientation='vertical', padding=dp(16), spacing=dp(12))
+            content.add_widget(Label(text=reason, font_size=sp(14), color=color))
+            stats = self.runner.snapshot.stats
+            content.add_widget(Label(
+                text=f"Dias: {int(stats['age_days'])} | Mortos: {format_number(stats['dead'])}",
+                font_size=sp(12), color=C_TEXT
+            ))
+            btn = Button(text="Jogar novamente", size_hint_y=None, height=dp(44),
+                         background_color=(0.1, 0.3, 0.6, 1))
+            content.add_widget(btn)
+            popup = Popup(title=title, content=content, size_hint=(0.85, 0.5),
+                          background_color=C_PANEL)
+            btn.bind(on_press=lambda b: App.get_running_app().restart())
+            popup.open()
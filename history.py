@@ -0,0 +1,163 @@
+"""
+Per-region time series in fixed-size ring buffers.
+
+A HistoryRecorder attached as `species.history` appends one row per tick:
+infected/dead/healthy of every region and the world totals. Rows live in
+preallocated NumPy rings that store each row twice (at i and i + capacity),
+so the newest k rows are always one contiguous slice and every query is a
+read-only view, never a copy.
+
+Long games keep a second, downsampled ring (one row every `coarse_every`
+days), and rows that fall off the daily region ring can be spilled to an
+append-only file that is read back through a memory map.
+"""
+
+import os
+
+import numpy as np
+
+REGION_FIELDS = ("infected", "dead", "healthy")
+WORLD_FIELDS = ("infected", "dead", "healthy", "cure_progress")
+
+HISTORY_DAYS = 365
+HISTORY_BUDGET = 16 << 20     # bytes for the region rings
+WORLD_DAYS = 4096
+COARSE_EVERY = 7              # days
+
+
+def _readonly(view):
+    view.flags.writeable = False
+    return view
+
+
+class Ring:
+    """Fixed-capacity ring of rows; the newest rows are always contiguous."""
+
+    def __init__(self, capacity, row_shape, dtype):
+        self.capacity = capacity
+        self.data = np.zeros((2 * capacity,) + tuple(row_shape), dtype=dtype)
+        self.days = np.zeros(2 * capacity)
+        self.count = 0   # rows ever appended
+        self.size = 0    # rows currently held, <= capacity
+
+    def append(self, day, columns, on_evict=None):
+        """Append a row given as its leading-axis slices; on_evict(day, row) sees the row it replaces."""
+        c = self.capacity
+        pos = self.count % c
+        if self.size == c and on_evict is not None:
+            on_evict(self.days[pos], self.data[pos])
+        for k, col in enumerate(columns):
+            self.data[pos, k] = col
+        self.data[pos + c] = self.data[pos]
+        self.days[pos] = self.days[pos + c] = day
+        self.count += 1
+        self.size = min(self.size + 1, c)
+
+    def last(self, k=None):
+        """(days, rows) views of the newest k rows (default: all held), oldest first."""
+        k = self.size if k is None else max(0, min(k, self.size))
+        end = (self.count - 1) % self.capacity + self.capacity + 1 if self.count else 0
+        return _readonly(self.days[end - k:end]), _readonly(self.data[end - k:end])
+
+    def truncate(self, day):
+        """Drop the newest rows recorded after `day`."""
+        while self.size and self.days[(self.count - 1) % self.capacity] > day:
+            self.count -= 1
+            self.size -= 1
+
+
+class HistoryRecorder:
+    """Daily and downsampled per-region and world history of one species."""
+
+    def __init__(self, world, capacity=None, coarse_every=COARSE_EVERY, spill_path=None,
+                 budget_bytes=HISTORY_BUDGET):
+        n = len(world)
+        f = len(REGION_FIELDS)
+        if capacity is None:
+            # Daily and coarse rings, each written twice, in float32
+            capacity = max(8, min(HISTORY_DAYS, budget_bytes // (n * f * 4 * 2 * 2)))
+        self.world = world
+        self.coarse_every = coarse_every
+        self.regions = Ring(capacity, (f, n), np.float32)
+        self.regions_coarse = Ring(capacity, (f, n), np.float32)
+        self.totals = Ring(WORLD_DAYS, (len(WORLD_FIELDS),), np.float64)
+        self.totals_coarse = Ring(WORLD_DAYS, (len(WORLD_FIELDS),), np.float64)
+        self._next_coarse = None
+
+        self.spill_path = spill_path
+        self.spill_dtype = np.dtype([("day", "<f8"), ("values", "<f4", (f, n))])
+        self._spill = None
+        if spill_path:
+            self._spill = open(spill_path, "wb")
+
+    def close(self):
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    # ── Recording ────────────────────────────────────────────
+    def record(self, species):
+        day = species.age_days
+        columns = [species.region_column(field) for field in REGION_FIELDS]
+        totals = (species.total_infected, species.total_dead,
+                  float(columns[2].sum()), species.cure_progress)
+
+        self.regions.append(day, columns, self._spill_row if self._spill else None)
+        self.totals.append(day, totals)
+        if self._next_coarse is None or day >= self._next_coarse:
+            self.regions_coarse.append(day, columns)
+            self.totals_coarse.append(day, totals)
+            self._next_coarse = day + self.coarse_every
+
+    def _spill_row(self, day, row):
+        record = np.empty((), dtype=self.spill_dtype)
+        record["day"] = day
+        record["values"] = row
+        self._spill.write(record.tobytes())
+
+    def truncate(self, day):
+        """Forget everything recorded after `day` (e.g. after a timeline branch)."""
+        for ring in (self.regions, self.regions_coarse, self.totals, self.totals_coarse):
+            ring.truncate(day)
+        if self.regions_coarse.size:
+            self._next_coarse = self.regions_coarse.last(1)[0][0] + self.coarse_every
+        else:
+            self._next_coarse = None
+        if self._spill:
+            spilled = self.spilled()
+            if spilled is not None and spilled["day"][-1] > day:
+                keep = int(np.searchsorted(spilled["day"], day, side="right"))
+                del spilled
+                self._spill.truncate(keep * self.spill_dtype.itemsize)
+                self._spill.seek(0, os.SEEK_END)
+
+    # ── Queries ──────────────────────────────────────────────
+    def region(self, region_id, field="infected", days=None, resolution=1):
+        """(days, values) of one region for the last `days` rows at 1-day or coarse resolution."""
+        ring = self.regions if resolution == 1 else self.regions_coarse
+        d, rows = ring.last(days)
+        return d, rows[:, REGION_FIELDS.index(field), self.world.index[region_id]]
+
+    def regions_field(self, field="infected", days=None, resolution=1):
+        """(days, values[time, region]) of one field for every region."""
+        ring = self.regions if resolution == 1 else self.regions_coarse
+        d, rows = ring.last(days)
+        return d, rows[:, REGION_FIELDS.index(field)]
+
+    def world_curve(self, field="infected", days=None, resolution=1):
+        """(days, values) of a world total at 1-day or coarse resolution."""
+        ring = self.totals if resolution == 1 else self.totals_coarse
+        d, rows = ring.last(days)
+        return d, rows[:, WORLD_FIELDS.index(field)]
+
+    def spilled(self):
+        """Memory-mapped rows evicted from the daily region ring, or None.
+
+        Structured array with "day" and "values" [field, region] columns.
+        """
+        if not self._spill:
+            return None
+        self._spill.flush()
+        if os.path.getsize(self.spill_path) == 0:
+            return None
+        return np.memmap(self.spill_path, dtype=self.spill_dtype, mode="r")
@@ -0,0 +1,121 @@
+"""
+Render cache for the world map.
+
+Each region polygon is triangulated once; the cache keeps interleaved
+vertex buffers (x, y, r, g, b, a) ready to hand to Kivy `Mesh`. A resize
+re-projects the normalized geometry in one vectorized pass and a tick only
+rewrites the color columns, so the canvas instructions are never rebuilt.
+"""
+
+import numpy as np
+
+# Kivy meshes index vertices with unsigned shorts
+MAX_BATCH_VERTICES = 65535
+
+VERTEX_FORMAT = [(b"vPosition", 2, "float"), (b"vColor", 4, "float")]
+C_INFECTED = np.array([0.95, 0.1, 0.05], dtype=np.float32)
+
+
+def _cross(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def triangulate(poly):
+    """Ear-clipping triangulation of a flat [x0, y0, ...] polygon.
+
+    Returns (i, j, k) vertex index triples into the polygon's points.
+    """
+    xs, ys = poly[0::2], poly[1::2]
+    n = len(xs)
+    area = sum(xs[i] * ys[(i + 1) % n] - xs[(i + 1) % n] * ys[i] for i in range(n))
+    ring = list(range(n)) if area > 0 else list(range(n - 1, -1, -1))
+
+    tris = []
+    while len(ring) > 3:
+        m = len(ring)
+        for k in range(m):
+            a, b, c = ring[k - 1], ring[k], ring[(k + 1) % m]
+            if _cross(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) <= 0:
+                continue  # reflex or degenerate corner
+            if any(_cross(xs[a], ys[a], xs[b], ys[b], xs[p], ys[p]) >= 0
+                   and _cross(xs[b], ys[b], xs[c], ys[c], xs[p], ys[p]) >= 0
+                   and _cross(xs[c], ys[c], xs[a], ys[a], xs[p], ys[p]) >= 0
+                   for p in ring if p not in (a, b, c)):
+                continue  # another vertex inside the ear
+            tris.append((a, b, c))
+            del ring[k]
+            break
+        else:
+            # Self-intersecting or degenerate leftover: fan it
+            tris.extend((ring[0], ring[i], ring[i + 1]) for i in range(1, len(ring) - 1))
+            return tris
+    tris.append(tuple(ring))
+    return tris
+
+
+class MeshBatch:
+    """One Kivy Mesh worth of regions."""
+
+    def __init__(self, points, vertex_region, triangles, edges):
+        self.points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.vertex_region = np.asarray(vertex_region, dtype=np.int64)  # world region index
+        self.triangles = np.asarray(triangles, dtype=np.uint16).ravel()
+        self.edges = np.asarray(edges, dtype=np.uint16).ravel()
+        self.vertices = np.zeros((len(self.points), 6), dtype=np.float32)
+
+
+class MapMeshCache:
+    """Triangulated, batched geometry for every region of a world."""
+
+    def __init__(self, world):
+        self.world = world
+        self.base_colors = np.array([r["color_base"] for r in world.records], dtype=np.float32)
+        self.batches = []
+
+        points, vertex_region, triangles, edges = [], [], [], []
+        for i, r in enumerate(world.records):
+            poly = r["poly"]
+            n = len(poly) // 2
+            if vertex_region and len(vertex_region) + n > MAX_BATCH_VERTICES:
+                self.batches.append(MeshBatch(points, vertex_region, triangles, edges))
+                points, vertex_region, triangles, edges = [], [], [], []
+            base = len(vertex_region)
+            triangles.extend(base + v for tri in triangulate(poly) for v in tri)
+            edges.extend(base + v for k in range(n) for v in (k, (k + 1) % n))
+            points.extend(poly)
+            vertex_region.extend([i] * n)
+        if vertex_region:
+            self.batches.append(MeshBatch(points, vertex_region, triangles, edges))
+
+    def project(self, x, y, width, height):
+        """Write widget-space positions for all vertices (y grows downwards in map space)."""
+        scale = np.array([width, -height], dtype=np.float32)
+        offset = np.array([x, y + height], dtype=np.float32)
+        for batch in self.batches:
+            np.multiply(batch.points, scale, out=batch.vertices[:, :2])
+            batch.vertices[:, :2] += offset
+
+    def region_colors(self, infected, dead, population):
+        """RGBA per region: base color blended to red by infection, darkened by deaths."""
+        pop = np.maximum(population, 1).astype(np.float64)
+        inf = np.sqrt(np.clip(infected / pop, 0.0, 1.0))[:, None].astype(np.float32)
+        shade = (1.0 - np.minimum(0.8, dead / pop))[:, None].astype(np.float32)
+        rgba = np.ones((len(pop), 4), dtype=np.float32)
+        rgba[:, :3] = (self.base_colors * (1 - inf) + C_INFECTED * inf) * shade
+        return rgba
+
+    def recolor(self, colors):
+        """Write per-region RGBA colors into every batch's vertex colors."""
+        for batch in self.batches:
+            batch.vertices[:, 2:] = colors[batch.vertex_region]
+
+
+def region_state_arrays(regions, world):
+    """(infected, dead, population) arrays of a region-state mapping, such as
+    a runner snapshot's regions, from either engine."""
+    fields = ("infected", "dead", "population")
+    column = getattr(regions, "column", None)
+    if column is not None:
+        return tuple(column(field) for field in fields)
+    states = [regions[rid] for rid in world.ids]
+    return tuple(np.array([s[field] for s in states], dtype=np.int64) for field in fields)
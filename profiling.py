@@ -0,0 +1,109 @@
+"""
+Lightweight per-phase timing.
+
+Code under measurement does `t = prof.start()` ... `prof.stop("phase", t)`.
+The default NULL_PROFILER makes both calls no-ops, so instrumentation stays
+in place at near-zero cost; swapping in a PhaseProfiler turns it on and
+collects rolling percentiles plus a trace exportable to chrome://tracing.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+
+class NullProfiler:
+    enabled = False
+
+    def start(self):
+        return 0.0
+
+    def stop(self, name, t0):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class PhaseProfiler:
+    """Rolling per-phase timings (ms) and a bounded event trace."""
+
+    enabled = True
+
+    def __init__(self, window=300, max_events=20_000):
+        self.window = window
+        self.samples = {}
+        self.events = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+
+    def start(self):
+        return time.perf_counter()
+
+    def stop(self, name, t0):
+        dur = time.perf_counter() - t0
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(dur * 1000)
+        self.events.append((name, t0, dur, threading.get_ident()))
+
+    def percentile(self, name, q):
+        """q-th percentile (0-100) of the recent durations of `name`, in ms."""
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+    def rate(self, name, window_s=1.0):
+        """Occurrences of `name` per second over the last window_s seconds."""
+        since = time.perf_counter() - window_s
+        count = 0
+        # Copied first: the simulation thread appends while the UI reads
+        for event in reversed(list(self.events)):
+            if event[1] < since:
+                break
+            if event[0] == name:
+                count += 1
+        return count / window_s
+
+    def top(self, n=3, q=95, exclude=()):
+        """The n phases with the highest q-th percentile, as (name, ms)."""
+        ranked = [(name, self.percentile(name, q)) for name in list(self.samples) if name not in exclude]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+
+    def chrome_trace(self):
+        """Collected events in Chrome trace-event format."""
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {"name": name, "ph": "X", "pid": 1, "tid": tid,
+                 "ts": (t0 - self._origin) * 1e6, "dur": dur * 1e6}
+                for name, t0, dur, tid in list(self.events)
+            ],
+        }
+
+    def export_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class StartupTimer:
+    """Wall time of consecutive launch phases, in ms, from construction on."""
+
+    def __init__(self):
+        self.t0 = self._last = time.perf_counter()
+        self.phases = []
+
+    def mark(self, name):
+        """End the current phase as `name`."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def total(self):
+        return (self._last - self.t0) * 1000
+
+    def report(self):
+        return " | ".join(f"{name} {ms:.0f} ms" for name, ms in self.phases) + f" | total {self.total():.0f} ms"
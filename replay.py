@@ -0,0 +1,75 @@
+"""
+Record and replay of PathogenSpecies runs.
+
+A run is fully determined by its engine, origin, seed and input log (gene
+purchases, speed changes and fast-forwards, each tagged with the tick it
+happened on), so a log replays to the exact same trajectory headlessly.
+"""
+
+import importlib
+import json
+
+LOG_VERSION = 1
+
+ENGINES = {
+    "PathogenSpecies": "game.evolution",
+    "ArrayPathogenSpecies": "game.array_engine",
+    "TauLeapPathogenSpecies": "game.tau_engine",
+}
+
+
+def engine_class(name):
+    return getattr(importlib.import_module(ENGINES[name]), name)
+
+
+def make_log(species):
+    return {
+        "version": LOG_VERSION,
+        "engine": type(species).__name__,
+        "name": species.name,
+        "origin": species.origin_id,
+        "seed": species.seed,
+        "ticks": species.tick_count,
+        "inputs": [list(entry) for entry in species.input_log],
+    }
+
+
+def save_log(species, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(make_log(species), f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_log(path):
+    with open(path, encoding="utf-8") as f:
+        log = json.load(f)
+    if log.get("version") != LOG_VERSION:
+        raise ValueError(f"unsupported replay log version: {log.get('version')}")
+    return log
+
+
+def replay(log, ticks=None, world=None):
+    """Rebuild the species recorded in `log`, up to `ticks` (default: all)."""
+    species = engine_class(log["engine"])(log["name"], log["origin"], world=world, seed=log["seed"])
+    end = log["ticks"] if ticks is None else ticks
+
+    for at, kind, *args in log["inputs"]:
+        if at > end:
+            break
+        while species.tick_count < at:
+            species.tick(dt_days=1.0)
+        if kind == "evolve":
+            species.evolve_gene(*args)
+        elif kind == "advance":
+            species.advance(*args)
+        elif kind == "speed":
+            species.record_speed(*args)
+        elif kind == "close_routes":
+            species.close_routes(*args)
+        elif kind == "reseed":
+            species.reseed(*args)
+        else:
+            raise ValueError(f"unknown replay input: {kind}")
+
+    while species.tick_count < end:
+        species.tick(dt_days=1.0)
+    return species
@@ -0,0 +1,258 @@
+"""
+Background simulation runner.
+
+Advances a PathogenSpecies on a worker thread so that slow days never block
+the Kivy clock. The UI only ever reads `runner.snapshot`, an immutable view
+of the last published state, and sends inputs as queued commands.
+"""
+
+import logging
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import Future
+from types import MappingProxyType
+
+from game.profiling import NULL_PROFILER
+from game.savegame import capture, restore
+
+log = logging.getLogger(__name__)
+
+# Wall-time slice per catch-up chunk; progress is published after each one
+CATCHUP_CHUNK_MS = 50
+
+SimSnapshot = namedtuple("SimSnapshot",
+                         "version stats regions genes gene_versions age_days dna_points cured")
+
+
+def take_snapshot(species):
+    """Immutable copy of everything the UI reads from a species."""
+    return SimSnapshot(
+        version=species.version,
+        stats=MappingProxyType(species.get_stats()),
+        regions=species.region_snapshot(),
+        genes=MappingProxyType({k: g.value for k, g in species.genes.items()}),
+        gene_versions=MappingProxyType({k: g.version for k, g in species.genes.items()}),
+        age_days=species.age_days,
+        dna_points=species.dna_points,
+        cured=species.cured,
+    )
+
+
+class SimulationRunner:
+    """Runs species ticks on a worker thread with a fixed per-frame day budget.
+
+    Snapshots are double-buffered: the worker builds the next one in the back
+    slot while the UI reads the front one, and publishing is a single index
+    flip. Day requests beyond `max_days_per_frame` are dropped, so a slow
+    simulation makes the game run slower instead of stalling the frame.
+    """
+
+    def __init__(self, species, max_days_per_frame=4, timeline=None):
+        self.species = species
+        self.max_days_per_frame = max_days_per_frame
+        self.timeline = timeline
+        if timeline is not None:
+            timeline.record(species)
+
+        # deque append/popleft are atomic, so producers never take a lock
+        self._day_requests = deque()
+        self._commands = deque()
+        self._catchups = deque()
+        self._wake = threading.Event()
+        self._stopped = False
+        self.profiler = NULL_PROFILER
+
+        # (days done, days total) while an offline catch-up runs, else None
+        self.catchup_progress = None
+
+        snap = take_snapshot(species)
+        self._slots = [snap, snap]
+        self._front = 0
+
+        self._thread = threading.Thread(target=self._run, name="sim-runner", daemon=True)
+        self._thread.start()
+
+    @property
+    def snapshot(self):
+        return self._slots[self._front]
+
+    # ── UI thread ─────────────────────────────────────────────
+    def request_days(self, days):
+        self._day_requests.append(days)
+        self._wake.set()
+
+    def evolve_gene(self, gene_key, amount=0.1):
+        """Queue a gene purchase; it is applied between ticks."""
+        self._commands.append((self._call, ("evolve_gene", gene_key, amount)))
+        self._wake.set()
+
+    def set_speed(self, speed):
+        """Record a speed change in the species' input log, in tick order."""
+        self._commands.append((self._call, ("record_speed", speed)))
+        self._wake.set()
+
+    def fast_forward(self, days):
+        """Queue an offline catch-up of `days`, run in chunks on the worker."""
+        self.catchup_progress = (0, days)
+        self._catchups.append(days)
+        self._wake.set()
+
+    def branch(self, day):
+        """Queue a rewind to `day` of the timeline; `species` is then replaced."""
+        if self.timeline is None:
+            raise ValueError("runner has no timeline to branch from")
+        self._commands.append((self._branch, (day,)))
+        self._wake.set()
+
+    def save(self, saver):
+        """Queue a save: the state is captured between ticks and handed to `saver`."""
+        self._commands.append((self._save, (saver,)))
+        self._wake.set()
+
+    def forecast(self, forecaster, days=180, members=32):
+        """Queue an ensemble forecast from the state between ticks.
+
+        Returns a Future of the game.forecast.Forecast; poll it from the UI.
+        """
+        future = Future()
+        self._commands.append((self._forecast, (forecaster, days, members, future)))
+        self._wake.set()
+        return future
+
+    def hint(self, autoplayer):
+        """Queue a hint: the state is captured between ticks and the
+        game.autoplay.Autoplayer rolls out the purchases on an array-engine
+        copy of it, on its own thread.
+
+        Returns a Future of the gene key to buy, or None to keep the DNA.
+        """
+        future = Future()
+        self._commands.append((self._hint, (autoplayer, future)))
+        self._wake.set()
+        return future
+
+    def stop(self, timeout=None):
+        """Stop the worker after it applies the queued commands (and saves)."""
+        self._stopped = True
+        self._wake.set()
+        if timeout is not None:
+            self._thread.join(timeout)
+
+    # ── Worker thread ─────────────────────────────────────────
+    def _call(self, method, *args):
+        # Resolved when applied, so commands follow a branch to the new species
+        getattr(self.species, method)(*args)
+
+    def _apply_commands(self):
+        applied = False
+        while self._commands:
+            func, args = self._commands.popleft()
+            try:
+                func(*args)
+            except Exception:
+                # A failed command must not take the worker thread down with it
+                log.exception("simulation command %s failed", getattr(func, "__name__", func))
+            applied = True
+        return applied
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped:
+                self._apply_commands()
+                return
+
+            days = 0
+            while self._day_requests:
+                days += self._day_requests.popleft()
+            days = min(days, self.max_days_per_frame)
+
+            changed = self._apply_commands()
+            for _ in range(days):
+                self.species.tick(dt_days=1.0)
+                self._record()
+                self._apply_commands()
+                changed = True
+
+            if changed:
+                self._publish()
+
+            while self._catchups and not self._stopped:
+                self._catch_up(self._catchups.popleft())
+
+    def _catch_up(self, total):
+        done = 0
+        while done < total and not self._stopped:
+            step = self.species.advance(total - done, budget_ms=CATCHUP_CHUNK_MS)
+            if not step:
+                break
+            done += step
+            self._record()
+            self._apply_commands()
+            self.catchup_progress = (done, total)
+            self._publish()
+        self.catchup_progress = None
+
+    def _record(self):
+        if self.timeline is not None:
+            t = self.profiler.start()
+            self.timeline.record(self.species)
+            self.profiler.stop("timeline", t)
+
+    def _branch(self, day):
+        profiler, history = self.species.profiler, self.species.history
+        species = self.timeline.branch(day)
+        species.profiler = profiler
+        if history is not None:
+            history.truncate(species.age_days)
+            species.history = history
+        # Published before the swap, so the UI adopting it reads its snapshot
+        self._publish(species)
+        self.species = species
+
+    def _save(self, saver):
+        t = self.profiler.start()
+        saver.submit(capture(self.species))
+        self.profiler.stop("save.capture", t)
+
+    def _forecast(self, forecaster, days, members, future):
+        t = self.profiler.start()
+        state = capture(self.species)
+        self.profiler.stop("forecast.capture", t)
+        try:
+            pending = forecaster.submit(state, days, members)
+        except Exception as e:
+            future.set_exception(e)
+            return
+
+        def done(f):
+            if f.exception() is not None:
+                future.set_exception(f.exception())
+            else:
+                future.set_result(f.result())
+        pending.add_done_callback(done)
+
+    def _hint(self, autoplayer, future):
+        # The rollouts only read region arrays: capture them here and rebuild
+        # an array-engine copy on the hint thread, whatever engine the game runs
+        t = self.profiler.start()
+        state = capture(self.species)
+        balance = self.species.balance
+        self.profiler.stop("hint.capture", t)
+
+        def choose():
+            try:
+                species = restore(state, engine="ArrayPathogenSpecies")
+                species.balance = balance
+                future.set_result(autoplayer.choose(species))
+            except Exception as e:
+                future.set_exception(e)
+        threading.Thread(target=choose, name="hint", daemon=True).start()
+
+    def _publish(self, species=None):
+        t = self.profiler.start()
+        back = 1 - self._front
+        self._slots[back] = take_snapshot(species or self.species)
+        self._front = back
+        self.profiler.stop("publish", t)
@@ -0,0 +1,249 @@
+"""
+Binary save games.
+
+A save file is a short uncompressed preamble followed by one zlib stream:
+
+    "PSAV" | u16 format version | zlib( u32 header size | header JSON | arrays )
+
+The JSON header holds the scalars, genes, RNG states and input log; the
+per-region state and route closures follow as raw little-endian arrays. With
+the array engines saving a large world is a few buffer copies with no
+per-region objects; the dict engine keeps its state in per-region dicts, so
+its export and import are one pass over them.
+
+capture() only copies arrays and is cheap enough to run between two ticks;
+encoding, compression and the write happen on an AutoSaver's writer thread.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+from game.replay import engine_class
+
+SAVE_VERSION = 1
+MAGIC = b"PSAV"
+PREAMBLE = struct.Struct("<4sH")
+HEADER_SIZE = struct.Struct("<I")
+COMPRESS_LEVEL = 6
+
+SaveState = namedtuple("SaveState", "header arrays")
+
+
+class SaveError(ValueError):
+    pass
+
+
+def world_signature(world):
+    """Checksum of a world's region ids, to refuse saves from another map."""
+    return zlib.crc32("\n".join(world.ids).encode("utf-8"))
+
+
+# ── Capture / restore ────────────────────────────────────────
+
+def capture(species):
+    """SaveState of `species`: plain header values plus copied arrays."""
+    version, state, gauss = species.rng.getstate()
+    header = {
+        "engine": type(species).__name__,
+        "name": species.name,
+        "origin": species.origin_id,
+        "seed": species.seed,
+        "world": world_signature(species.world),
+        "saved_at": time.time(),
+        "tick_count": species.tick_count,
+        "age_days": species.age_days,
+        "dna_points": species.dna_points,
+        "evolved_traits": list(species.evolved_traits),
+        "cured": species.cured,
+        "cure_progress": species.cure_progress,
+        "genes": {k: [g.value, g.version] for k, g in species.genes.items()},
+        "rng": [version, list(state), gauss],
+        "np_rng": species.np_rng.bit_generator.state if hasattr(species, "np_rng") else None,
+        "input_log": list(species.input_log),
+    }
+    arrays = species.export_regions()
+    arrays["closed_routes"] = species.closed_routes.copy()
+    return SaveState(header, arrays)
+
+
+def restore(state, world=None, engine=None):
+    """New species rebuilt from a SaveState, as its own engine or the `engine`
+    class name given; SaveError if it doesn't fit one."""
+    try:
+        return _restore(state, world, engine)
+    except SaveError:
+        raise
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise SaveError(f"corrupt save state: {type(e).__name__}: {e}") from None
+
+
+def _restore(state, world, engine):
+    h = state.header
+    species = engine_class(engine or h["engine"])(h["name"], h["origin"], world=world, seed=h["seed"])
+    if h["world"] != world_signature(species.world):
+        raise SaveError("save belongs to a different world map")
+
+    species.import_regions(state.arrays)
+    species.closed_routes[:] = state.arrays["closed_routes"]
+    species._routes_version += 1
+    for key, (value, version) in h["genes"].items():
+        gene = species.genes[key]
+        gene.value = value
+        gene.version = version
+
+    species.tick_count = h["tick_count"]
+    species.age_days = h["age_days"]
+    species.dna_points = h["dna_points"]
+    species.evolved_traits = list(h["evolved_traits"])
+    species.cured = h["cured"]
+    species.cure_progress = h["cure_progress"]
+    species.input_log = [tuple(entry) for entry in h["input_log"]]
+
+    version, rng_state, gauss = h["rng"]
+    species.rng.setstate((version, tuple(rng_state), gauss))
+    if h["np_rng"] is not None and hasattr(species, "np_rng"):
+        species.np_rng.bit_generator.state = h["np_rng"]
+    species._changed()
+    return species
+
+
+# ── Encoding ─────────────────────────────────────────────────
+
+def encode(state, level=COMPRESS_LEVEL):
+    header = dict(state.header)
+    header["arrays"] = [[name, arr.dtype.newbyteorder("<").str, len(arr)]
+                        for name, arr in state.arrays.items()]
+    head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    comp = zlib.compressobj(level)
+    chunks = [PREAMBLE.pack(MAGIC, SAVE_VERSION),
+              comp.compress(HEADER_SIZE.pack(len(head))), comp.compress(head)]
+    for (_, dtype, _), arr in zip(header["arrays"], state.arrays.values()):
+        chunks.append(comp.compress(np.ascontiguousarray(arr, dtype=dtype).data))
+    chunks.append(comp.flush())
+    return b"".join(chunks)
+
+
+def decode(data):
+    """SaveState of an encoded save; any malformed input raises SaveError."""
+    try:
+        magic, version = PREAMBLE.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise SaveError("not a save file")
+        if version != SAVE_VERSION:
+            raise SaveError(f"unsupported save version: {version}")
+        body = memoryview(zlib.decompress(data[PREAMBLE.size:]))
+
+        (size,) = HEADER_SIZE.unpack_from(body, 0)
+        offset = HEADER_SIZE.size + size
+        if offset > len(body):
+            raise SaveError("corrupt save file: truncated header")
+        header = json.loads(bytes(body[HEADER_SIZE.size:offset]).decode("utf-8"))
+        arrays = {}
+        for name, dtype, count in header.pop("arrays"):
+            dtype = np.dtype(dtype)
+            if count < 0 or offset + dtype.itemsize * count > len(body):
+                raise SaveError(f"corrupt save file: truncated array {name}")
+            arr = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+            arrays[name] = arr.astype(arr.dtype.newbyteorder("="))
+            offset += arr.nbytes
+    except SaveError:
+        raise
+    except (struct.error, zlib.error, ValueError, KeyError, TypeError) as e:
+        # ValueError covers bad JSON, bad UTF-8 and bad dtypes
+        raise SaveError(f"corrupt save file: {type(e).__name__}: {e}") from None
+    return SaveState(header, arrays)
+
+
+def write_state(path, state):
+    """Encode and write atomically: readers see the old save or the new one."""
+    data = encode(state)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def read_state(path):
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def save_game(species, path):
+    write_state(path, capture(species))
+
+
+def load_game(path, world=None):
+    return restore(read_state(path), world=world)
+
+
+# ── Autosave ─────────────────────────────────────────────────
+
+class AutoSaver:
+    """Writes submitted SaveStates to `path` on a background thread.
+
+    Only the newest pending state is kept: if saves arrive faster than the
+    disk takes them, intermediate ones are skipped.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.saves = 0
+        self.last_error = None
+        self._pending = None
+        self._writing = False
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, state):
+        with self._cond:
+            self._pending = state
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until nothing is pending or being written; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def discard(self):
+        """Drop any pending save and delete the file (e.g. when the game ends)."""
+        with self._cond:
+            self._pending = None
+            self._cond.wait_for(lambda: not self._writing)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def stop(self, timeout=None):
+        """Finish the pending write, then end the thread."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._stopped)
+                if self._pending is None:
+                    return
+                state, self._pending = self._pending, None
+                self._writing = True
+            try:
+                write_state(self.path, state)
+                self.saves += 1
+                self.last_error = None
+            except OSError as e:
+                self.last_error = e
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
@@ -0,0 +1,145 @@
+"""
+Headless batch runner for the pathogen simulation.
+
+Never imports Kivy, so it is cheap to start for balance sweeps and CI:
+
+    python -m game.sim br --days 365 --seed 7 --plan 10:transmission,30:air_spread
+    python -m game.sim cn --engine array --format csv --every 7 -o run.csv
+    python -m game.sim in --engine tau --adaptive --days 3650 --every 30
+    python -m game.sim --replay run.log.json
+
+A plan is either inline `day:gene[:amount]` items separated by commas or a
+JSON file with a list of {"day": ..., "gene": ..., "amount": ...} objects.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from game.evolution import GENE_DEFINITIONS
+from game.profiling import PhaseProfiler
+from game.replay import engine_class, load_log, replay, save_log
+from game.world_data import WORLD
+
+ENGINE_NAMES = {"dict": "PathogenSpecies", "array": "ArrayPathogenSpecies",
+                "tau": "TauLeapPathogenSpecies"}
+FIELDS = ("day", "infected", "dead", "infected_pct", "dead_pct",
+          "regions_hit", "cure_pct", "dna_points", "cured")
+GENE_KEYS = {gkey for _, gkey, _, _ in GENE_DEFINITIONS}
+
+
+def parse_plan(spec):
+    """Gene evolution plan as a sorted list of (day, gene_key, amount)."""
+    if spec.endswith(".json"):
+        with open(spec, encoding="utf-8") as f:
+            items = [(e["day"], e["gene"], e.get("amount", 0.1)) for e in json.load(f)]
+    else:
+        items = []
+        for part in filter(None, spec.split(",")):
+            day, gene, *amount = part.split(":")
+            items.append((int(day), gene, float(amount[0]) if amount else 0.1))
+
+    for _, gene, _ in items:
+        if gene not in GENE_KEYS:
+            raise ValueError(f"unknown gene: {gene}")
+    return sorted(items, key=lambda e: e[0])
+
+
+def stats_row(species, day=None):
+    # Ticks and days differ once adaptive steps cover several days per tick
+    day = int(species.age_days) if day is None else day
+    stats = dict(species.get_stats(), day=day, cured=species.cured)
+    return {name: stats[name] for name in FIELDS}
+
+
+def run(species, days, plan=(), every=1, adaptive=False):
+    """Run `days` days applying `plan`; yields a stats row every `every` days.
+
+    Days are one tick each, or with `adaptive` fast-forwarded in the
+    engine's own step sizes (see PathogenSpecies.advance) between rows and
+    plan items.
+    """
+    plan = list(plan)
+    day = 0
+    while day < days:
+        while plan and plan[0][0] <= day:
+            _, gene, amount = plan.pop(0)
+            species.evolve_gene(gene, amount)
+        if adaptive:
+            stop = min(days, (day // every + 1) * every, plan[0][0] if plan else days)
+            day += species.advance(stop - day)
+        else:
+            species.tick(dt_days=1.0)
+            day += 1
+        if species.cured or day % every == 0:
+            yield stats_row(species, day if adaptive else None)
+        if species.cured:
+            return
+
+
+def write_rows(rows, out, fmt):
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m game.sim", description=__doc__.split("\n\n")[0])
+    parser.add_argument("origin", nargs="?", help="origin region id (e.g. br, cn)")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--name", default="Patógeno X")
+    parser.add_argument("--engine", choices=sorted(ENGINE_NAMES), default="dict")
+    parser.add_argument("--plan", default="", help="day:gene[:amount],... or a .json file")
+    parser.add_argument("--every", type=int, default=1, help="emit stats every N days")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="fast-forward in adaptive multi-day steps (best with --engine tau)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--replay", metavar="LOG", help="replay a recorded input log instead")
+    parser.add_argument("--save-log", metavar="PATH", help="write the run's replay log")
+    parser.add_argument("--trace", metavar="PATH", help="write per-phase timings as a Chrome trace")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        species = replay(load_log(args.replay))
+        rows = [stats_row(species)]
+    else:
+        if args.origin not in WORLD.index:
+            parser.error(f"unknown origin region: {args.origin}")
+        try:
+            plan = parse_plan(args.plan)
+        except ValueError as e:
+            parser.error(str(e))
+        cls = engine_class(ENGINE_NAMES[args.engine])
+        species = cls(args.name, args.origin, seed=args.seed)
+        if args.trace:
+            species.profiler = PhaseProfiler(max_events=1_000_000)
+        rows = run(species, args.days, plan, max(1, args.every), args.adaptive)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        write_rows(rows, out, args.format)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.save_log:
+        save_log(species, args.save_log)
+    if args.trace:
+        species.profiler.export_chrome_trace(args.trace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Spatial index over the normalized region polygons.
+
+Region polygons are bucketed by bounding box into a uniform grid, so a
+point lookup only runs point-in-polygon on the few regions whose boxes
+cover the point's cell. Region centers are bucketed the same way for the
+nearest-region fallback used when a tap lands in the sea.
+"""
+
+import math
+
+
+def point_in_polygon(x, y, poly):
+    """Ray-casting test; poly is a flat [x0, y0, x1, y1, ...] list."""
+    inside = False
+    n = len(poly) // 2
+    x1, y1 = poly[-2], poly[-1]
+    for i in range(n):
+        x2, y2 = poly[2 * i], poly[2 * i + 1]
+        if (y2 > y) != (y1 > y) and x < (x1 - x2) * (y - y2) / (y1 - y2) + x2:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+class SpatialIndex:
+    """Uniform-grid lookup of regions by normalized (0..1) map coordinates."""
+
+    def __init__(self, world, cells=None):
+        # Records and ids only, not the world itself, so a per-world cache
+        # of indexes (see world_map.spatial_index) doesn't keep it alive
+        self.records = world.records
+        self.ids = world.ids
+        n = len(world)
+        # About one region per cell keeps buckets short at any map size
+        self.cells = cells or max(4, min(512, int(math.sqrt(n)) + 1))
+        c = self.cells
+
+        self.bboxes = []
+        self.buckets = [[] for _ in range(c * c)]
+        self.center_buckets = [[] for _ in range(c * c)]
+
+        for i, r in enumerate(world.records):
+            poly = r["poly"]
+            xs, ys = poly[0::2], poly[1::2]
+            box = (min(xs), min(ys), max(xs), max(ys))
+            self.bboxes.append(box)
+            cx0, cy0 = self._cell(box[0], box[1])
+            cx1, cy1 = self._cell(box[2], box[3])
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    self.buckets[cy * c + cx].append(i)
+
+            cx, cy = self._cell(*r["center"])
+            self.center_buckets[cy * c + cx].append(i)
+
+    def _cell(self, x, y):
+        c = self.cells
+        return (min(c - 1, max(0, int(x * c))), min(c - 1, max(0, int(y * c))))
+
+    def hit(self, x, y):
+        """Index of the region whose polygon contains (x, y), or None."""
+        cx, cy = self._cell(x, y)
+        records = self.records
+        for i in self.buckets[cy * self.cells + cx]:
+            x0, y0, x1, y1 = self.bboxes[i]
+            if x0 <= x <= x1 and y0 <= y <= y1 and point_in_polygon(x, y, records[i]["poly"]):
+                return i
+        return None
+
+    def nearest(self, x, y, max_dist=None):
+        """Index of the region with the closest center, or None beyond max_dist."""
+        c = self.cells
+        cx, cy = self._cell(x, y)
+        records = self.records
+        best, best_d2 = None, math.inf
+        limit = c if max_dist is None else int(max_dist * c) + 1
+
+        # Search rings of cells outwards until no closer center can exist
+        for ring in range(limit + 1):
+            if best is not None and ((ring - 1) / c) ** 2 > best_d2:
+                break
+            for gy in range(cy - ring, cy + ring + 1):
+                if not 0 <= gy < c:
+                    continue
+                step = 1 if gy in (cy - ring, cy + ring) else 2 * ring or 1
+                for gx in range(cx - ring, cx + ring + 1, step):
+                    if not 0 <= gx < c:
+                        continue
+                    for i in self.center_buckets[gy * c + gx]:
+                        px, py = records[i]["center"]
+                        d2 = (px - x) ** 2 + (py - y) ** 2
+                        if d2 < best_d2:
+                            best, best_d2 = i, d2
+
+        if best is None or (max_dist is not None and best_d2 > max_dist ** 2):
+            return None
+        return best
+
+    def region_at(self, x, y, snap=0.06):
+        """Region id under (x, y), falling back to the nearest one within `snap`."""
+        i = self.hit(x, y)
+        if i is None:
+            i = self.nearest(x, y, max_dist=snap)
+        return None if i is None else self.ids[i]
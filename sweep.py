@@ -0,0 +1,276 @@
+"""
+Parameter sweeps for game balance.
+
+Runs many headless games over a grid or a Latin-hypercube sample of
+parameters, several seeds each, on all cores, and aggregates win, cure and
+extinction rates and time to cure per parameter point:
+
+    python -m game.sweep --param gene.transmission=0.1,0.3,0.5 \\
+        --param origin=br,cn,in --seeds 16 --days 1460
+    python -m game.sweep --method lhs --samples 200 \\
+        --param balance.spread=0.05:0.12 --param balance.cure_research=0.001:0.004 \\
+        --param plan=10:transmission,30:air_spread --format csv -o sweep.csv
+
+Parameters:
+    gene.<key>       starting gene value (see GENE_DEFINITIONS)
+    balance.<name>   model constant (see evolution.BALANCE)
+    origin           origin region id
+    plan             evolution plan, as game.sim --plan (use ';' between plans)
+    engine           dict, array or tau
+
+`a,b,c` lists values; `lo:hi` is a numeric range (Latin hypercube only).
+
+Every run is cached on disk under a content address of its parameters,
+seed, day count and the code version (a hash of the simulation sources
+and world file), so repeating or extending a sweep only runs new points.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+
+import numpy as np
+
+from game.events import WIN_DEAD
+from game.evolution import BALANCE, GENE_DEFINITIONS
+from game.replay import engine_class
+from game.sim import ENGINE_NAMES, parse_plan, run
+from game.world_data import WORLD, WORLD_FILE
+
+# Files whose contents decide a run's result
+CODE_FILES = ("evolution.py", "array_engine.py", "tau_engine.py", "travel.py", "events.py",
+              "replay.py", "world_data.py", "world_format.py", "sim.py", "sweep.py")
+CACHE_DIR = ".sweep-cache"
+
+GENE_KEYS = {gkey for _, gkey, _, _ in GENE_DEFINITIONS}
+DEFAULTS = {"engine": "array", "origin": "br", "plan": ""}
+
+
+def code_version():
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in CODE_FILES + (WORLD_FILE,):
+        path = name if os.path.isabs(name) else os.path.join(here, name)
+        with open(path, "rb") as f:
+            digest.update(name.encode("utf-8") + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+# ── Parameter spaces ─────────────────────────────────────────
+
+def parse_param(spec):
+    """`name=a,b,c` -> (name, [values]); `name=lo:hi` -> (name, (lo, hi))."""
+    name, _, values = spec.partition("=")
+    kind, _, key = name.partition(".")
+    if kind == "gene" and key not in GENE_KEYS:
+        raise ValueError(f"unknown gene: {key}")
+    if kind == "balance" and key not in BALANCE:
+        raise ValueError(f"unknown balance constant: {key}")
+    if kind not in ("gene", "balance") and name not in DEFAULTS:
+        raise ValueError(f"unknown parameter: {name}")
+
+    if kind in ("gene", "balance") and values.count(":") == 1 and "," not in values:
+        lo, hi = map(float, values.split(":"))
+        return name, (lo, hi)
+    sep = ";" if name == "plan" else ","
+    items = values.split(sep)
+    if kind in ("gene", "balance"):
+        items = [float(v) for v in items]
+    return name, items
+
+
+def grid(space):
+    names = list(space)
+    for name in names:
+        if isinstance(space[name], tuple):
+            raise ValueError(f"{name}: ranges need --method lhs")
+    return [dict(zip(names, combo)) for combo in itertools.product(*space.values())]
+
+
+def latin_hypercube(space, samples, seed=None):
+    """`samples` points with every parameter's range split into equal strata,
+    each stratum used once; value lists are treated as categories."""
+    rng = np.random.default_rng(seed)
+    points = [{} for _ in range(samples)]
+    for name, values in space.items():
+        u = (rng.permutation(samples) + rng.random(samples)) / samples
+        for point, x in zip(points, u):
+            if isinstance(values, tuple):
+                lo, hi = values
+                point[name] = float(lo + x * (hi - lo))
+            else:
+                point[name] = values[min(int(x * len(values)), len(values) - 1)]
+    return points
+
+
+# ── Runs ─────────────────────────────────────────────────────
+
+def run_key(point, seed, days, version):
+    blob = json.dumps({"point": point, "seed": seed, "days": days, "code": version},
+                      sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def run_point(point, seed, days):
+    """Play one game; dict with its outcome, outcome day and final stats."""
+    p = dict(DEFAULTS, **point)
+    species = engine_class(ENGINE_NAMES[p["engine"]])("sweep", p["origin"], seed=seed)
+    balance = {key[8:]: value for key, value in p.items() if key.startswith("balance.")}
+    if balance:
+        species.balance = dict(BALANCE, **balance)
+    for key, value in p.items():
+        if key.startswith("gene."):
+            species.genes[key[5:]].value = value
+
+    # The game's win check, capped at the world population
+    win_dead = min(WIN_DEAD, species.world.total_population)
+    outcome, day = "ongoing", None
+    for row in run(species, days, parse_plan(p["plan"])):
+        if species.cured:
+            outcome, day = "cured", species.age_days
+        elif species.total_dead >= win_dead:
+            outcome, day = "won", species.age_days
+        elif species.total_infected == 0:
+            outcome, day = "extinct", species.age_days
+        if outcome != "ongoing":
+            break
+    stats = species.get_stats()
+    return {"outcome": outcome, "day": day, "dead_pct": stats["dead_pct"],
+            "infected_pct": stats["infected_pct"], "cure_pct": stats["cure_pct"]}
+
+
+class RunCache:
+    """Content-addressed run results: <dir>/<key[:2]>/<key>.json."""
+
+    def __init__(self, path=CACHE_DIR):
+        self.path = path
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], key + ".json")
+
+    def get(self, key):
+        try:
+            with open(self._file(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+
+def _run_job(job):
+    key, point, seed, days = job
+    return key, run_point(point, seed, days)
+
+
+def sweep(points, seeds, days, cache=None, workers=None, log=None):
+    """Aggregate rows per point, running only the (point, seed) pairs not cached."""
+    version = code_version()
+    results = {}
+    jobs = []
+    for point in points:
+        for seed in seeds:
+            key = run_key(point, seed, days, version)
+            cached = cache.get(key) if cache else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                jobs.append((key, point, seed, days))
+    if log:
+        print(f"{len(points)} points x {len(seeds)} seeds: "
+              f"{len(results)} cached, {len(jobs)} to run", file=log)
+
+    if jobs:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            chunk = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+            for key, result in pool.map(_run_job, jobs, chunksize=chunk):
+                results[key] = result
+                if cache:
+                    cache.put(key, result)
+
+    rows = []
+    for point in points:
+        runs = [results[run_key(point, seed, days, version)] for seed in seeds]
+        rows.append(dict(point, **aggregate(runs)))
+    return rows
+
+
+def aggregate(runs):
+    n = len(runs)
+    outcomes = [r["outcome"] for r in runs]
+    cure_days = [r["day"] for r in runs if r["outcome"] == "cured"]
+    return {
+        "runs": n,
+        "win_rate": outcomes.count("won") / n,
+        "cure_rate": outcomes.count("cured") / n,
+        "extinct_rate": outcomes.count("extinct") / n,
+        "ongoing_rate": outcomes.count("ongoing") / n,
+        "cure_day_mean": float(np.mean(cure_days)) if cure_days else None,
+        "cure_day_median": float(np.median(cure_days)) if cure_days else None,
+        "dead_pct_mean": float(np.mean([r["dead_pct"] for r in runs])),
+    }
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.sweep", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUES")
+    parser.add_argument("--method", choices=("grid", "lhs"), default="grid")
+    parser.add_argument("--samples", type=int, default=64, help="points for --method lhs")
+    parser.add_argument("--seeds", type=int, default=8, help="games per point")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed (and LHS seed)")
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--cache", default=CACHE_DIR, help="cache directory ('' to disable)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("-o", "--output", default="-")
+    args = parser.parse_args(argv)
+
+    try:
+        space = dict(parse_param(spec) for spec in args.param)
+        for origin in space.get("origin", ()):
+            if origin not in WORLD.index:
+                raise ValueError(f"unknown origin region: {origin}")
+        for engine in space.get("engine", ()):
+            if engine not in ENGINE_NAMES:
+                raise ValueError(f"unknown engine: {engine}")
+        for plan in space.get("plan", ()):
+            parse_plan(plan)
+        points = grid(space) if args.method == "grid" else \
+            latin_hypercube(space, args.samples, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    seeds = list(range(args.seed, args.seed + args.seeds))
+    cache = RunCache(args.cache) if args.cache else None
+    rows = sweep(points, seeds, args.days, cache, args.workers, log=sys.stderr)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        if args.format == "csv":
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]), lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
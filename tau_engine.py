@@ -0,0 +1,146 @@
+"""
+Tau-leaping stochastic engine.
+
+The deterministic engines truncate every flow with int(), so a handful of
+infected never grows, small regions never lose anyone and results depend
+on dt_days. Here each step draws its transitions instead:
+
+- new infections ~ Binomial(healthy, 1 - exp(-spread * exposure / pop))
+- departures    ~ Binomial(infected, (death + recovery) * exposure / infected),
+  split into deaths and recoveries binomially
+- route jumps and mutations ~ Poisson(expected count over the step)
+
+all vectorized across regions. `exposure` is the infected-days of the step
+with the region growing exponentially at its current rate, so a long step
+keeps the right expected dynamics instead of treating infected as constant.
+
+advance() picks leaps with the Cao-Gillespie-Petzold condition: no
+compartment's mean or spread of change over the leap may exceed
+TAU_EPSILON of its size (or one person), which lets quiet phases cover
+up to ADVANCE_MAX_STEP days per step.
+"""
+
+import numpy as np
+
+from game.array_engine import ArrayPathogenSpecies
+from game.evolution import ADVANCE_MAX_STEP
+from game.events import RegionDiscovered, RegionInfected
+
+TAU_EPSILON = 0.03
+
+
+class TauLeapPathogenSpecies(ArrayPathogenSpecies):
+    """Array engine with binomial/Poisson transitions and adaptive leaps."""
+
+    def _mutate(self, dt):
+        for _ in range(self.np_rng.poisson(self.genes["mutation"].value * self.balance["mutation"] * dt)):
+            self._mutate_once()
+
+    def _advance_step(self):
+        """Whole-day leap that keeps every compartment's change within TAU_EPSILON."""
+        idx = np.flatnonzero((self.infected > 0) & (self.population > 0))
+        if not idx.size:
+            return ADVANCE_MAX_STEP
+        c = self._coefficients()
+        infected = self.infected[idx].astype(np.float64)
+        healthy = self.healthy[idx].astype(np.float64)
+        infect = infected * c.spread[idx] * healthy / self.population[idx]   # per day
+        leave = infected * (c.death + c.recover * c.recover_stealth)
+
+        tau = float(ADVANCE_MAX_STEP)
+        with np.errstate(divide="ignore"):
+            for size, mean, var in ((infected, infect - leave, infect + leave),
+                                    (healthy, -infect, infect)):
+                bound = np.maximum(TAU_EPSILON * size, 1.0)
+                tau = min(tau, float((bound / np.abs(mean)).min()), float((bound ** 2 / var).min()))
+        return max(1, int(tau))
+
+    def _spread(self, dt):
+        c = self._coefficients()
+        rng = self.np_rng
+
+        idx = np.flatnonzero((self.infected > 0) & (self.population > 0))
+        if idx.size:
+            pop = self.population[idx]
+            infected = self.infected[idx]
+            healthy = self.healthy[idx]
+
+            death = c.death
+            leave = death + c.recover * c.recover_stealth
+            # Infected-days over the step, taking the region's current growth
+            # rate as exponential instead of constant infected: integrating the
+            # hazards over it keeps the expected trend exact for long steps
+            x = (c.spread[idx] * healthy / pop - leave) * dt
+            growth = np.ones_like(x)
+            moving = x != 0
+            growth[moving] = np.expm1(x[moving]) / x[moving]
+            exposure = infected * dt * growth
+
+            # New infections: each healthy host's chance over the step
+            new_inf = rng.binomial(healthy, -np.expm1(-c.spread[idx] * exposure / pop))
+
+            # Deaths and recoveries (lowered by resistance)
+            at_risk = infected + new_inf
+            leaving = rng.binomial(at_risk, np.minimum(1.0, leave * exposure / np.maximum(at_risk, 1)))
+            new_dead = rng.binomial(leaving, death / leave if leave > 0 else 0.0)
+
+            now_infected = infected + new_inf - leaving
+            self.infected[idx] = now_infected
+            self.dead[idx] += new_dead
+            self.healthy[idx] = healthy - new_inf
+
+            self.total_infected += int(now_infected.sum() - infected.sum())
+            self.total_dead += int(new_dead.sum())
+            self.regions_hit -= int(np.count_nonzero(now_infected == 0))
+
+            # Discovery
+            hidden = ~self.discovered[idx]
+            if hidden.any():
+                hazard = (exposure[hidden] / pop[hidden]) * c.discover * self.balance["discovery"]
+                found = rng.random(hazard.size) < -np.expm1(-hazard)
+                self.discovered[idx[hidden][found]] = True
+                self.regions_discovered += int(np.count_nonzero(found))
+                if found.any():
+                    self._emit_regions(RegionDiscovered, idx[hidden][found].tolist())
+
+            self.infection_rate[idx] = infected / pop
+
+        # Cross-region spread
+        t = self.profiler.start()
+        self._cross_region_spread(dt)
+        self.profiler.stop("cross_spread", t)
+
+    def _cross_region_spread(self, dt):
+        """Seed other regions with a Poisson number of jumps per target."""
+        src = np.flatnonzero((self.infected > 100) & (self.population > 0))
+        if not src.size:
+            return
+
+        rng = self.np_rng
+        weight = self.infected[src] / self.population[src] * dt
+        targets, pressure = self.travel.pressure(self._route_rates()[0], src, weight)
+        jumps = rng.poisson(pressure)
+        arrived = jumps > 0
+        fired, jumps = targets[arrived], jumps[arrived]
+        if not fired.size:
+            return
+
+        # The sum of `jumps` uniform seed sizes, drawn as one uniform with the same mean
+        infected, healthy = self.infected, self.healthy
+        new = (infected[fired] == 0) & (healthy[fired] > 0)
+        grow = infected[fired] > 0
+        if new.any():
+            t, k = fired[new], jumps[new]
+            seed = np.minimum(healthy[t], rng.integers(k, k * self._jump_seed[t], endpoint=True))
+            infected[t] = seed
+            healthy[t] -= seed
+            self.total_infected += int(seed.sum())
+            self.regions_hit += t.size
+            self._emit_regions(RegionInfected, t.tolist())
+        if grow.any():
+            t, k = fired[grow], jumps[grow]
+            cap = np.maximum(1, (healthy[t] * 0.001).astype(np.int64))
+            extra = np.minimum(healthy[t], rng.integers(k, k * cap, endpoint=True))
+            infected[t] += extra
+            healthy[t] -= extra
+            self.total_infected += int(extra.sum())
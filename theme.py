@@ -0,0 +1,26 @@
+"""
+Colors and helpers shared by the menu and the game screen.
+
+Kept free of game modules, so the menu can draw before they are imported.
+"""
+
+from kivy.graphics import Color, Rectangle
+
+# ─── Colors ───────────────────────────────────────────────────
+C_BG        = (0.03, 0.05, 0.12, 1)
+C_PANEL     = (0.06, 0.10, 0.20, 1)
+C_ACCENT    = (0.9, 0.3, 0.05, 1)
+C_GREEN     = (0.1, 0.85, 0.3, 1)
+C_RED       = (0.9, 0.1, 0.1, 1)
+C_YELLOW    = (0.95, 0.85, 0.1, 1)
+C_TEXT      = (0.92, 0.92, 0.92, 1)
+C_SUBTEXT   = (0.60, 0.65, 0.75, 1)
+
+
+def make_bg(widget, color):
+    """Add dark background rectangle to widget."""
+    with widget.canvas.before:
+        Color(*color)
+        widget._bg_rect = Rectangle(pos=widget.pos, size=widget.size)
+    widget.bind(pos=lambda w, v: setattr(w._bg_rect, 'pos', v),
+                size=lambda w, v: setattr(w._bg_rect, 'size', v))
@@ -0,0 +1,192 @@
+"""
+Rewind timeline: periodic keyframes plus per-day deltas.
+
+A keyframe is a full savegame capture (so it also carries the RNG state and
+input log); each later day stores only the region entries that changed since
+the day before, plus the scalars, genes and inputs of that day. Seeking
+restores the nearest keyframe at or before the day and applies its deltas.
+
+Memory stays under `budget_bytes`: the deltas of the oldest segments are
+dropped first (those days then rewind to keyframe granularity), then the
+oldest keyframes themselves. The latest segment is never evicted.
+"""
+
+import bisect
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from game.savegame import SaveState, capture, restore
+
+KEYFRAME_EVERY = 30          # days
+TIMELINE_BUDGET = 4 << 20    # bytes
+# Rough Python-object cost of a keyframe header (RNG state, log) and a delta
+KEYFRAME_OVERHEAD = 24_000
+DELTA_OVERHEAD = 600
+
+SCALARS = ("tick_count", "age_days", "dna_points", "cured", "cure_progress")
+
+Delta = namedtuple("Delta", "day scalars genes traits inputs changes nbytes")
+
+
+class Segment:
+    """A keyframe and the deltas of the days after it."""
+
+    def __init__(self, state):
+        self.day = state.header["age_days"]
+        self.state = state
+        self.deltas = []
+        self.nbytes = KEYFRAME_OVERHEAD + sum(a.nbytes for a in state.arrays.values())
+
+
+def _state_arrays(species):
+    arrays = species.export_regions()
+    arrays["closed_routes"] = species.closed_routes.copy()
+    return arrays
+
+
+def _genes(species):
+    return {k: [g.value, g.version] for k, g in species.genes.items()}
+
+
+class Timeline:
+    """Recorded days of one game, seekable and branchable."""
+
+    def __init__(self, world=None, keyframe_every=KEYFRAME_EVERY, budget_bytes=TIMELINE_BUDGET):
+        self.world = world
+        self.keyframe_every = keyframe_every
+        self.budget_bytes = budget_bytes
+        self.nbytes = 0
+        self._segments = []
+        self._last = None        # arrays of the last recorded day
+        self._last_genes = None
+        self._last_traits = None
+        self._last_day = None
+        self._log_len = 0
+
+    def days(self):
+        """Recorded days that can be rewound to, oldest first."""
+        days = []
+        for seg in list(self._segments):
+            days.append(seg.day)
+            days.extend(d.day for d in list(seg.deltas))
+        return days
+
+    # ── Recording ────────────────────────────────────────────
+    def record(self, species):
+        """Store the species' current day (call after each tick)."""
+        day = species.age_days
+        if self._last_day is not None and day <= self._last_day:
+            return
+        if self.world is None:
+            self.world = species.world
+
+        if not self._segments or day - self._segments[-1].day >= self.keyframe_every:
+            seg = Segment(capture(species))
+            self._segments.append(seg)
+            self.nbytes += seg.nbytes
+            self._sync(species, seg.state.arrays)
+        else:
+            arrays = _state_arrays(species)
+            changes = {}
+            nbytes = DELTA_OVERHEAD
+            for name, cur in arrays.items():
+                idx = np.flatnonzero(cur != self._last[name])
+                if idx.size:
+                    changes[name] = (idx.astype(np.int32), cur[idx])
+                    nbytes += idx.size * (4 + cur.itemsize)
+
+            genes = _genes(species)
+            traits = list(species.evolved_traits)
+            delta = Delta(
+                day=day,
+                scalars={k: getattr(species, k) for k in SCALARS},
+                genes=genes if genes != self._last_genes else None,
+                traits=traits if traits != self._last_traits else None,
+                inputs=species.input_log[self._log_len:],
+                changes=changes,
+                nbytes=nbytes,
+            )
+            seg = self._segments[-1]
+            seg.deltas.append(delta)
+            seg.nbytes += nbytes
+            self.nbytes += nbytes
+            self._sync(species, arrays)
+        self._evict()
+
+    def _sync(self, species, arrays):
+        self._last = arrays
+        self._last_genes = _genes(species)
+        self._last_traits = list(species.evolved_traits)
+        self._last_day = species.age_days
+        self._log_len = len(species.input_log)
+
+    def _evict(self):
+        segments = self._segments
+        while self.nbytes > self.budget_bytes and len(segments) > 1:
+            # Oldest segment that still has deltas loses them first
+            seg = next((s for s in segments[:-1] if s.deltas), None)
+            if seg is None:
+                seg = segments.pop(0)
+                self.nbytes -= seg.nbytes
+                continue
+            freed = sum(d.nbytes for d in seg.deltas)
+            seg.deltas = []
+            seg.nbytes -= freed
+            self.nbytes -= freed
+
+    # ── Seeking ──────────────────────────────────────────────
+    def state_at(self, day):
+        """SaveState of the latest recorded day at or before `day`."""
+        segments = list(self._segments)
+        i = bisect.bisect_right([s.day for s in segments], day) - 1
+        if i < 0:
+            raise ValueError(f"day {day} is before the start of the timeline")
+        seg = segments[i]
+
+        header = dict(seg.state.header)
+        arrays = {name: arr.copy() for name, arr in seg.state.arrays.items()}
+        log = list(header["input_log"])
+        for delta in list(seg.deltas):
+            if delta.day > day:
+                break
+            for name, (idx, values) in delta.changes.items():
+                arrays[name][idx] = values
+            header.update(delta.scalars)
+            if delta.genes is not None:
+                header["genes"] = delta.genes
+            if delta.traits is not None:
+                header["evolved_traits"] = delta.traits
+            log.extend(delta.inputs)
+        header["input_log"] = log
+        return SaveState(header, arrays)
+
+    def seek(self, day):
+        """New species at the latest recorded day at or before `day`."""
+        return restore(self.state_at(day), world=self.world)
+
+    def branch(self, day, seed=None):
+        """Rewind to `day` and continue from there on fresh random streams.
+
+        Recorded days after it are dropped; the returned species keeps
+        recording into this timeline.
+        """
+        species = self.seek(day)
+        self.truncate(species.age_days)
+        self._sync(species, _state_arrays(species))
+        species.reseed(random.getrandbits(64) if seed is None else seed)
+        return species
+
+    def truncate(self, day):
+        """Forget every recorded day after `day`."""
+        segments = self._segments
+        while segments and segments[-1].day > day:
+            self.nbytes -= segments.pop().nbytes
+        if segments:
+            seg = segments[-1]
+            keep = [d for d in seg.deltas if d.day <= day]
+            freed = sum(d.nbytes for d in seg.deltas[len(keep):])
+            seg.deltas = keep
+            seg.nbytes -= freed
+            self.nbytes -= freed
@@ -0,0 +1,230 @@
+"""
+Sparse travel network between regions.
+
+Three kinds of routes are built once per world:
+
+- land: regions whose polygons touch, or nearby regions whose bounding
+  boxes are within LAND_GAP of each other;
+- air: every region with airports flies to the AIR_HUBS busiest hubs
+  (airports × sqrt(population));
+- sea: every region with ports sails to its SEA_NEIGHBORS nearest ports.
+
+Edges are stored in CSR form grouped by source region, so a tick only
+touches the out-edges of infected regions: cross-region seeding is one
+sparse matrix-vector product, jump rates per edge times the infected ratio
+per source, summed per target.
+"""
+
+import weakref
+
+import numpy as np
+
+MODES = ("land", "air", "sea")
+LAND, AIR, SEA = range(len(MODES))
+
+LAND_GAP = 0.02          # normalized map units between bounding boxes
+LAND_NEIGHBORS = 6       # nearest centers considered for a land route
+AIR_HUBS = 12
+SEA_NEIGHBORS = 6
+SEA_DISTANCE_BIAS = 0.05  # keeps short sea lanes from dominating
+
+
+def _knn(points, k):
+    """(rows, cols) pairs linking every point to about its k nearest others.
+
+    Points are bucketed into a uniform grid and each cell only compares
+    against the surrounding rings of cells that hold enough candidates, so
+    the result is exact except for rare neighbors just beyond that ring.
+    """
+    n = len(points)
+    k = min(k, n - 1)
+    if k <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    lo = points.min(axis=0)
+    span = max(float((points.max(axis=0) - lo).max()), 1e-9)
+    cells = max(1, int(np.sqrt(n / (k + 1))))
+    cell = np.minimum(((points - lo) / span * cells).astype(np.int64), cells - 1)
+    key = cell[:, 1] * cells + cell[:, 0]
+    order = np.argsort(key, kind="stable")
+    bounds = np.searchsorted(key[order], np.arange(cells * cells + 1))
+
+    def members(x0, x1, y0, y1):
+        x0, x1, y0, y1 = max(x0, 0), min(x1, cells - 1), max(y0, 0), min(y1, cells - 1)
+        return np.concatenate([order[bounds[y * cells + x0]:bounds[y * cells + x1 + 1]]
+                               for y in range(y0, y1 + 1)])
+
+    rows, cols = [], []
+    for c in np.unique(key):
+        cx, cy = c % cells, c // cells
+        here = order[bounds[c]:bounds[c + 1]]
+        ring = 1
+        while True:
+            cand = members(cx - ring, cx + ring, cy - ring, cy + ring)
+            if len(cand) > k or ring >= cells:
+                break
+            ring += 1
+        # One more ring covers neighbors just past the cell corner
+        cand = members(cx - ring - 1, cx + ring + 1, cy - ring - 1, cy + ring + 1)
+        d2 = ((points[here, None, :] - points[None, cand, :]) ** 2).sum(axis=2)
+        d2[here[:, None] == cand[None, :]] = np.inf
+        nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        rows.append(np.repeat(here, k))
+        cols.append(cand[nearest].ravel())
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def _symmetric(src, dst, n):
+    """Unique undirected pairs from (src, dst), as both directions."""
+    keep = src != dst
+    a = np.concatenate([src[keep], dst[keep]])
+    b = np.concatenate([dst[keep], src[keep]])
+    key = np.unique(a.astype(np.int64) * n + b)
+    return key // n, key % n
+
+
+class TravelNetwork:
+    """Immutable route graph of a world, in CSR form by source region."""
+
+    def __init__(self, world):
+        n = self.n = len(world)
+        records = world.records
+        ports = np.array(world.ports, dtype=np.float64)
+        airports = np.array(world.airports, dtype=np.float64)
+        population = np.array(world.population, dtype=np.float64)
+        centers = np.array([r["center"] for r in records], dtype=np.float64).reshape(n, 2)
+
+        src, dst, mode, weight = [], [], [], []
+
+        def add(kind, s, d, w):
+            src.append(s)
+            dst.append(d)
+            mode.append(np.full(len(s), kind, dtype=np.uint8))
+            weight.append(w)
+
+        # Land: touching polygons, plus near neighbors across small gaps
+        boxes = np.empty((n, 4))
+        owners = {}
+        for i, r in enumerate(records):
+            poly = np.asarray(r["poly"], dtype=np.float64).reshape(-1, 2)
+            boxes[i] = poly[:, 0].min(), poly[:, 1].min(), poly[:, 0].max(), poly[:, 1].max()
+            for vertex in set(map(tuple, np.round(poly * 1e4).astype(np.int64).tolist())):
+                owners.setdefault(vertex, []).append(i)
+        pairs = [(a, b) for regions in owners.values() for a in regions for b in regions if a != b]
+        touch = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        near_s, near_d = _knn(centers, LAND_NEIGHBORS)
+        gap = np.maximum(
+            np.maximum(boxes[near_s, 0] - boxes[near_d, 2], boxes[near_d, 0] - boxes[near_s, 2]),
+            np.maximum(boxes[near_s, 1] - boxes[near_d, 3], boxes[near_d, 1] - boxes[near_s, 3]))
+        close = gap <= LAND_GAP
+        s, d = _symmetric(np.concatenate([touch[:, 0], near_s[close]]),
+                          np.concatenate([touch[:, 1], near_d[close]]), n)
+        add(LAND, s, d, np.ones(len(s)))
+
+        # Air: gravity between airports and the busiest hubs
+        score = airports * np.sqrt(population)
+        flying = np.flatnonzero(airports > 0)
+        hubs = flying[np.argsort(-score[flying], kind="stable")[:AIR_HUBS + 1]]
+        s, d = _symmetric(np.repeat(flying, len(hubs)), np.tile(hubs, len(flying)), n)
+        add(AIR, s, d, score[s] * score[d])
+
+        # Sea: nearest ports, weighted by port capacity over distance
+        harbors = np.flatnonzero(ports > 0)
+        if len(harbors) > 1:
+            rows, cols = _knn(centers[harbors], SEA_NEIGHBORS)
+            s, d = _symmetric(harbors[rows], harbors[cols], n)
+            dist = np.sqrt(((centers[s] - centers[d]) ** 2).sum(axis=1))
+            add(SEA, s, d, ports[s] * ports[d] / (dist + SEA_DISTANCE_BIAS))
+
+        src, dst = np.concatenate(src), np.concatenate(dst)
+        mode, weight = np.concatenate(mode), np.concatenate(weight)
+
+        # Normalize each source's routes per mode, so a mode's total jump
+        # rate out of a region does not depend on how many routes it has
+        share = np.zeros(len(src))
+        modes_out = np.zeros(n)
+        for kind in range(len(MODES)):
+            sel = mode == kind
+            total = np.bincount(src[sel], weights=weight[sel], minlength=n)
+            share[sel] = weight[sel] / total[src[sel]]
+            modes_out += total > 0
+
+        order = np.lexsort((dst, src))
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))])
+        self.sources = src[order]
+        self.indices = dst[order]
+        self.mode = mode[order]
+        share = share[order]
+        # Jump weights per edge for the three gene terms of cross-region spread
+        self.generic = share / modes_out[self.sources]
+        self.air = np.where(self.mode == AIR, share, 0.0)
+        self.sea = np.where(self.mode == SEA, share * ports[self.sources], 0.0)
+        # Plain lists for the pure-Python engine's edge loop
+        self.indptr_list = self.indptr.tolist()
+        self.indices_list = self.indices.tolist()
+
+    @property
+    def size(self):
+        return len(self.indices)
+
+    def edge_mask(self, mode=None, region=None):
+        """Edges of `mode` (a MODES name) touching region index `region`; None matches all."""
+        mask = np.ones(self.size, dtype=bool)
+        if mode is not None:
+            mask &= self.mode == MODES.index(mode)
+        if region is not None:
+            mask &= (self.sources == region) | (self.indices == region)
+        return mask
+
+    def rates(self, generic, air, sea):
+        """Per-edge jumps per day at infected ratio 1, given each route kind's
+        weight (travel gene value x balance factor)."""
+        return generic * self.generic + air * self.air + sea * self.sea
+
+    def max_inbound(self, rates):
+        """Largest total jump rate any single region can receive."""
+        if not self.size:
+            return 0.0
+        return float(np.bincount(self.indices, weights=rates, minlength=self.n).max())
+
+    def out_edges(self, sources):
+        """(edge ids of every source's CSR row concatenated, edges per source)."""
+        start = self.indptr[sources]
+        count = self.indptr[sources + 1] - start
+        first = np.repeat(start - np.cumsum(count) + count, count)
+        return first + np.arange(len(first)), count
+
+    def pressure(self, rates, sources, weights):
+        """Sparse product: summed rates[e] * weights[source] into each target.
+
+        Only the out-edges of `sources` are read. Returns (targets, pressure)
+        for the targets that receive any.
+        """
+        start = self.indptr[sources]
+        count = self.indptr[sources + 1] - start
+        total = int(count.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        if total > self.size // 2:
+            # Most regions active: a full pass beats gathering their rows
+            x = np.zeros(self.n)
+            x[sources] = weights
+            pressure = np.bincount(self.indices, weights=rates * x[self.sources], minlength=self.n)
+        else:
+            edges, count = self.out_edges(sources)
+            contrib = rates[edges] * np.repeat(weights, count)
+            pressure = np.bincount(self.indices[edges], weights=contrib, minlength=self.n)
+        targets = np.flatnonzero(pressure)
+        return targets, pressure[targets]
+
+
+_NETWORKS = weakref.WeakKeyDictionary()
+
+
+def travel_network(world):
+    """Shared TravelNetwork per world, built on first use."""
+    network = _NETWORKS.get(world)
+    if network is None:
+        network = _NETWORKS[world] = TravelNetwork(world)
+    return network
@@ -0,0 +1,274 @@
+"""
+Compiled world files (.pwld).
+
+Region attributes are stored column by column and polygons as one shared
+vertex buffer, so a world loads by memory-mapping the file: attributes come
+back as typed zero-copy arrays and a polygon is decoded only when a record's
+"poly" is read. Authoring happens in JSON ({"continents": ..., "regions": [...]},
+the REGIONS schema); compile and inspect with
+
+    python -m game.world_format build world.json world.pwld
+    python -m game.world_format dump world.pwld
+
+Layout (little-endian): a header, a directory of named sections
+(typecode, offset, count) and the 8-byte aligned section payloads.
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+FORMAT_VERSION = 1
+MAGIC = b"PWLD"
+HEADER = struct.Struct("<4sHHI")       # magic, version, flags, section count
+ENTRY = struct.Struct("<16sc7xQQ")     # name, typecode, offset, item count
+
+# Climate names by code; hot paths branch on the small int, not the string
+CLIMATES = ("temperate", "tropical", "cold", "arid")
+
+RECORD_KEYS = ("id", "name", "continent", "pop", "climate", "gdp", "ports",
+               "airports", "color_base", "center", "poly")
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+class WorldFileError(ValueError):
+    pass
+
+
+# ── Writing ──────────────────────────────────────────────────
+
+def world_sections(regions, continents):
+    """Section name -> array/bytes payload for a region list."""
+    regions = list(regions)
+    names = list(continents)
+    for r in regions:
+        if r["continent"] not in names:
+            names.append(r["continent"])
+    colors = [continents.get(name, {}).get("color", (0.5, 0.5, 0.5, 0.3)) for name in names]
+
+    poly_start = array("I", [0])
+    vertices = array("d")
+    for r in regions:
+        vertices.extend(r["poly"])
+        poly_start.append(len(vertices) // 2)
+
+    meta = {
+        "ids": [r["id"] for r in regions],
+        "names": [r["name"] for r in regions],
+        "continents": names,
+    }
+    return {
+        "pop": array("d", (r["pop"] for r in regions)),
+        "color": array("d", (c for r in regions for c in r["color_base"])),
+        "center": array("d", (c for r in regions for c in r["center"])),
+        "poly_start": poly_start,
+        "vertices": vertices,
+        "climate": array("B", (CLIMATES.index(r.get("climate", "temperate")) for r in regions)),
+        "gdp": array("B", (r.get("gdp", 0) for r in regions)),
+        "ports": array("B", (r.get("ports", 0) for r in regions)),
+        "airports": array("B", (r.get("airports", 0) for r in regions)),
+        "continent": array("H", (names.index(r["continent"]) for r in regions)),
+        "continent_color": array("d", (c for color in colors for c in color)),
+        "meta": json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+    }
+
+
+def write_world(path, regions, continents):
+    sections = world_sections(regions, continents)
+    offset = _align(HEADER.size + ENTRY.size * len(sections))
+    directory, payloads = [], []
+    for name, data in sections.items():
+        if isinstance(data, bytes):
+            code, count = "s", len(data)
+        else:
+            if sys.byteorder != "little":
+                data = array(data.typecode, data)
+                data.byteswap()
+            code, count, data = data.typecode, len(data), data.tobytes()
+        directory.append(ENTRY.pack(name.encode("ascii"), code.encode("ascii"), offset, count))
+        payloads.append((offset, data))
+        offset = _align(offset + len(data))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(sections)))
+        f.write(b"".join(directory))
+        for start, data in payloads:
+            f.write(b"\0" * (start - f.tell()))
+            f.write(data)
+
+
+# ── Reading ──────────────────────────────────────────────────
+
+class WorldFile:
+    """Memory-mapped world file; section arrays are views into the mapping."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._map)
+
+        magic, version, _flags, count = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise WorldFileError(f"{path}: not a world file")
+        if version != FORMAT_VERSION:
+            raise WorldFileError(f"{path}: unsupported world format version {version}")
+
+        self.sections = {}
+        for k in range(count):
+            name, code, offset, n = ENTRY.unpack_from(buf, HEADER.size + k * ENTRY.size)
+            code = code.decode("ascii")
+            size = n if code == "s" else n * array(code).itemsize
+            view = buf[offset:offset + size]
+            if code != "s":
+                view = view.cast(code)
+                if sys.byteorder != "little":
+                    view = array(code, view)
+                    view.byteswap()
+            self.sections[name.rstrip(b"\0").decode("ascii")] = view
+
+        meta = json.loads(bytes(self.sections["meta"]).decode("utf-8"))
+        self.ids = tuple(meta["ids"])
+        self.names = tuple(meta["names"])
+        self.continent_names = tuple(meta["continents"])
+
+        s = self.sections
+        self.pop = s["pop"]                          # millions of people
+        self.climate = s["climate"]                  # CLIMATES codes
+        self.gdp = s["gdp"]
+        self.ports = s["ports"]
+        self.airports = s["airports"]
+        self.continent = s["continent"]              # index into continent_names
+        self.color = s["color"]                      # flat r, g, b per region
+        self.center = s["center"]                    # flat x, y per region
+        self.poly_start = s["poly_start"]            # region i owns points [start[i], start[i + 1])
+        self.vertices = s["vertices"]                # flat x, y of every polygon point
+        self.continent_colors = s["continent_color"]  # flat r, g, b, a per continent
+
+        self.records = RegionRecords(self)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def poly_view(self, i):
+        """Zero-copy flat [x0, y0, ...] view of region i's polygon."""
+        return self.vertices[2 * self.poly_start[i]:2 * self.poly_start[i + 1]]
+
+    def continents(self):
+        """CONTINENTS-style dict: name -> {"color": (r, g, b, a)}."""
+        c = self.continent_colors
+        return {name: {"color": tuple(c[4 * k:4 * k + 4])}
+                for k, name in enumerate(self.continent_names)}
+
+
+class RegionRecord(Mapping):
+    """Read-only region dict in the REGIONS schema, decoded on access."""
+
+    __slots__ = ("file", "i")
+
+    def __init__(self, world_file, i):
+        self.file = world_file
+        self.i = i
+
+    def __getitem__(self, key):
+        f, i = self.file, self.i
+        if key == "id":
+            return f.ids[i]
+        if key == "name":
+            return f.names[i]
+        if key == "continent":
+            return f.continent_names[f.continent[i]]
+        if key == "pop":
+            pop = f.pop[i]
+            return int(pop) if pop.is_integer() else pop
+        if key == "climate":
+            return CLIMATES[f.climate[i]]
+        if key in ("gdp", "ports", "airports"):
+            return getattr(f, key)[i]
+        if key == "color_base":
+            return tuple(f.color[3 * i:3 * i + 3])
+        if key == "center":
+            return tuple(f.center[2 * i:2 * i + 2])
+        if key == "poly":
+            return f.poly_view(i).tolist()
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(RECORD_KEYS)
+
+    def __len__(self):
+        return len(RECORD_KEYS)
+
+    def __repr__(self):
+        return f"<RegionRecord {self.file.ids[self.i]!r}>"
+
+
+class RegionRecords(Sequence):
+    """REGIONS-compatible sequence; records are created on demand."""
+
+    __slots__ = ("file",)
+
+    def __init__(self, world_file):
+        self.file = world_file
+
+    def __len__(self):
+        return len(self.file.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [RegionRecord(self.file, k) for k in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("region index out of range")
+        return RegionRecord(self.file, i)
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["regions"], data.get("continents", {})
+
+
+def dump(world_file):
+    """JSON-ready {"continents", "regions"} with plain dict records."""
+    return {
+        "continents": {name: {"color": list(c["color"])}
+                       for name, c in world_file.continents().items()},
+        "regions": [dict(r) for r in world_file.records],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.world_format",
+                                     description="Compile or inspect world files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile a JSON world into a .pwld file")
+    build.add_argument("source")
+    build.add_argument("output")
+    show = sub.add_parser("dump", help="print a .pwld file as JSON")
+    show.add_argument("world")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        regions, continents = load_json(args.source)
+        write_world(args.output, regions, continents)
+        print(f"{args.output}: {len(regions)} regions", file=sys.stderr)
+    else:
+        json.dump(dump(WorldFile(args.world)), sys.stdout, ensure_ascii=False, indent=1)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+World map widget: draws the regions and turns touches into region ids.
+
+Geometry is triangulated once into batched meshes (see game.map_mesh);
+resizes re-project the cached vertices and simulation updates only rewrite
+their colors, so the canvas instructions are built a single time.
+"""
+
+import weakref
+
+import numpy as np
+from kivy.clock import Clock
+from kivy.graphics import Mesh, RenderContext
+from kivy.uix.widget import Widget
+
+from game.map_mesh import MapMeshCache, VERTEX_FORMAT, region_state_arrays
+from game.spatial import SpatialIndex
+from game.world_data import WORLD
+
+C_SEA = (0.02, 0.07, 0.16, 1)
+C_BORDER = (0.01, 0.02, 0.05, 1)
+C_HOVER = (1, 1, 1, 1)
+C_FLASH = (1, 0.85, 0.2, 1)
+FLASH_SECONDS = 1.0
+
+# Per-vertex colors need a shader that reads them from the mesh
+MAP_VS = """
+$HEADER$
+attribute vec4 vColor;
+void main(void) {
+    frag_color = vColor * vec4(1.0, 1.0, 1.0, opacity);
+    tex_coord0 = vTexCoords0;
+    gl_Position = projection_mat * modelview_mat * vec4(vPosition.xy, 0.0, 1.0);
+}
+"""
+MAP_FS = """
+$HEADER$
+void main(void) {
+    gl_FragColor = frag_color;
+}
+"""
+
+_INDEXES = weakref.WeakKeyDictionary()
+
+
+def spatial_index(world=WORLD):
+    """Shared SpatialIndex per world, built on first use."""
+    index = _INDEXES.get(world)
+    if index is None:
+        index = _INDEXES[world] = SpatialIndex(world)
+    return index
+
+
+def _flat_vertices(points, color):
+    """Flat vertex buffer for points of a single color."""
+    vertices = np.empty((len(points), 6), dtype=np.float32)
+    vertices[:, :2] = points
+    vertices[:, 2:] = color
+    return vertices.ravel()
+
+
+class WorldMapWidget(Widget):
+    def __init__(self, runner, on_region_click, world=WORLD, **kwargs):
+        self.canvas = RenderContext(use_parent_projection=True,
+                                    use_parent_modelview=True,
+                                    use_parent_frag_modelview=True)
+        super().__init__(**kwargs)
+        self.canvas.shader.fs = MAP_FS
+        self.canvas.shader.vs = MAP_VS
+
+        self.runner = runner
+        self.on_region_click = on_region_click
+        self.world = world
+        self.index = spatial_index(world)
+        self.mesh_cache = MapMeshCache(world)
+        self.hover_id = None
+        self._colored_version = None
+        self._flashes = {}   # region id -> (expiry time, color)
+        self._flash_timer = None
+
+        self._build_canvas()
+        self.bind(pos=self._reproject, size=self._reproject)
+        Clock.schedule_interval(self._recolor, 0.5)
+
+    def stop(self):
+        Clock.unschedule(self._recolor)
+        Clock.unschedule(self._expire_flashes)
+
+    # ── Coordinates ──────────────────────────────────────────
+    def to_map(self, tx, ty):
+        """Widget touch position -> normalized map coords (y grows downwards)."""
+        if not self.width or not self.height:
+            return None
+        return (tx - self.x) / self.width, 1 - (ty - self.y) / self.height
+
+    def region_at(self, tx, ty):
+        pos = self.to_map(tx, ty)
+        return None if pos is None else self.index.region_at(*pos)
+
+    # ── Touch ────────────────────────────────────────────────
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        rid = self.region_at(*touch.pos)
+        if rid:
+            self.on_region_click(rid)
+        return True
+
+    def on_touch_move(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_move(touch)
+        rid = self.region_at(*touch.pos)
+        if rid != self.hover_id:
+            self.hover_id = rid
+            self._update_hover()
+        return True
+
+    def on_touch_up(self, touch):
+        if self.hover_id is not None:
+            self.hover_id = None
+            self._update_hover()
+        return super().on_touch_up(touch)
+
+    # ── Drawing ──────────────────────────────────────────────
+    def _build_canvas(self):
+        with self.canvas:
+            self._sea = Mesh(fmt=VERTEX_FORMAT, mode='triangle_fan', indices=[0, 1, 2, 3])
+            self._fills = [Mesh(fmt=VERTEX_FORMAT, mode='triangles', indices=b.triangles.tolist())
+                           for b in self.mesh_cache.batches]
+            self._borders = [Mesh(fmt=VERTEX_FORMAT, mode='lines', indices=b.edges.tolist())
+                             for b in self.mesh_cache.batches]
+            self._hover = Mesh(fmt=VERTEX_FORMAT, mode='line_loop')
+            self._flash = Mesh(fmt=VERTEX_FORMAT, mode='lines')
+        self._reproject()
+
+    def _reproject(self, *args):
+        """Move the cached geometry to the current widget box, keeping colors."""
+        x, y, w, h = self.x, self.y, self.width, self.height
+        self._sea.vertices = _flat_vertices([(x, y), (x + w, y), (x + w, y + h), (x, y + h)], C_SEA)
+
+        cache = self.mesh_cache
+        cache.project(x, y, w, h)
+        self._colored_version = None
+        self._recolor()
+        for batch, border in zip(cache.batches, self._borders):
+            border.vertices = _flat_vertices(batch.vertices[:, :2], C_BORDER)
+        self._update_hover()
+        self._update_flash()
+
+    def _recolor(self, *args):
+        """Rewrite fill colors from the runner's latest snapshot."""
+        snap = self.runner.snapshot
+        if snap.version == self._colored_version:
+            return
+        self._colored_version = snap.version
+        cache = self.mesh_cache
+        cache.recolor(cache.region_colors(*region_state_arrays(snap.regions, self.world)))
+        for batch, fill in zip(cache.batches, self._fills):
+            fill.vertices = batch.vertices.ravel()
+
+    def _outline(self, region_id):
+        """Widget coordinates of a region's polygon."""
+        poly = np.asarray(self.world.record(region_id)["poly"], dtype=np.float32).reshape(-1, 2)
+        return poly * (self.width, -self.height) + (self.x, self.y + self.height)
+
+    def _update_hover(self):
+        if self.hover_id is None:
+            self._hover.vertices = []
+            self._hover.indices = []
+            return
+        points = self._outline(self.hover_id)
+        self._hover.vertices = _flat_vertices(points, C_HOVER)
+        self._hover.indices = list(range(len(points)))
+
+    # ── Flashes ──────────────────────────────────────────────
+    def flash(self, region_id, color=C_FLASH):
+        """Outline a region for FLASH_SECONDS, e.g. when the pathogen reaches it."""
+        self._flashes[region_id] = (Clock.get_time() + FLASH_SECONDS, color)
+        self._update_flash()
+        if self._flash_timer is None:
+            self._flash_timer = Clock.schedule_once(self._expire_flashes, FLASH_SECONDS)
+
+    def _expire_flashes(self, *args):
+        now = Clock.get_time()
+        self._flashes = {rid: f for rid, f in self._flashes.items() if f[0] > now}
+        self._update_flash()
+        self._flash_timer = None
+        if self._flashes:
+            next_expiry = min(expiry for expiry, _ in self._flashes.values())
+            self._flash_timer = Clock.schedule_once(self._expire_flashes, next_expiry - now)
+
+    def _update_flash(self):
+        """All flashing outlines as one line mesh."""
+        vertices, indices = [], []
+        start = 0
+        for rid, (_, color) in self._flashes.items():
+            points = self._outline(rid)
+            n = len(points)
+            vertices.append(_flat_vertices(points, color))
+            for i in range(n):
+                indices += (start + i, start + (i + 1) % n)
+            start += n
+        self._flash.vertices = np.concatenate(vertices) if vertices else []
+        self._flash.indices = indices